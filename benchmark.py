@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+"""
+Summarization Benchmark Module
+
+Compares generation presets on texts with reference summaries, reporting
+speed against ROUGE-1/2/L F1.
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _tokens(text: str) -> List[str]:
+    """Lowercase word tokens for ROUGE."""
+    return re.findall(r"\w+", text.lower())
+
+
+def _f1(overlap: int, candidate_total: int, reference_total: int) -> float:
+    """F1 from an overlap count and the two totals."""
+    if overlap == 0 or candidate_total == 0 or reference_total == 0:
+        return 0.0
+    precision = overlap / candidate_total
+    recall = overlap / reference_total
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(candidate: str, reference: str, n: int) -> float:
+    """
+    ROUGE-N F1 between a candidate and a reference summary.
+
+    Args:
+        candidate: Generated summary
+        reference: Reference summary
+        n: N-gram size
+
+    Returns:
+        F1 score between 0 and 1
+    """
+    def ngrams(tokens):
+        return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+    cand = ngrams(_tokens(candidate))
+    ref = ngrams(_tokens(reference))
+    overlap = sum((cand & ref).values())
+    return _f1(overlap, sum(cand.values()), sum(ref.values()))
+
+
+def rouge_l(candidate: str, reference: str) -> float:
+    """
+    ROUGE-L F1 (longest common subsequence) between two summaries.
+
+    Args:
+        candidate: Generated summary
+        reference: Reference summary
+
+    Returns:
+        F1 score between 0 and 1
+    """
+    cand = _tokens(candidate)
+    ref = _tokens(reference)
+
+    # LCS length with a single rolling row
+    row = [0] * (len(ref) + 1)
+    for c in cand:
+        prev = 0
+        for j, r in enumerate(ref, 1):
+            current = row[j]
+            row[j] = prev + 1 if c == r else max(row[j], row[j - 1])
+            prev = current
+
+    return _f1(row[-1], len(cand), len(ref))
+
+
+def load_samples(path: str) -> List[Dict]:
+    """
+    Load benchmark samples from a JSONL file.
+
+    Each line needs 'text' (e.g. a transcript) and 'reference' (its
+    reference summary).
+
+    Args:
+        path: JSONL file path
+
+    Returns:
+        List of sample dicts
+    """
+    samples = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            sample = json.loads(line)
+            if "text" not in sample or "reference" not in sample:
+                raise ValueError(f"{path}:{line_number}: sample needs 'text' and 'reference'")
+            samples.append(sample)
+    return samples
+
+
+def parse_preset_pair(spec: str) -> Tuple[str, str]:
+    """Parse 'map:reduce' (or a single preset for both stages)."""
+    map_preset, _, reduce_preset = spec.partition(":")
+    return map_preset, reduce_preset or map_preset
+
+
+def run_benchmark(summarizer, samples: List[Dict], preset_specs: List[str]) -> List[Dict]:
+    """
+    Summarize every sample with each preset pair and score the results.
+
+    The summarizer runs in strict mode, so a preset whose generation fails
+    stops the benchmark instead of being timed on fallback text. Samples of
+    Summarizer.max_direct_chars (1024) characters or fewer get a single
+    reduce pass and never use the map preset, so only longer samples can
+    show a difference between e.g. 'greedy:full' and 'full'.
+
+    Args:
+        summarizer: Summarizer instance; its presets are switched per run
+        samples: Dicts with 'text' and 'reference'
+        preset_specs: Preset pairs such as 'full', 'greedy:full' or 'assisted'
+
+    Returns:
+        One report dict per preset pair with timing and mean ROUGE scores
+    """
+    summarizer.strict = True
+    if summarizer.summarizer_pipeline is None:
+        summarizer.load_model()
+
+    short = sum(1 for sample in samples if len(sample["text"]) <= summarizer.max_direct_chars)
+    if short:
+        logger.warning(
+            f"{short} of {len(samples)} samples are {summarizer.max_direct_chars} characters or "
+            "shorter and skip the map stage; map presets only affect the other samples"
+        )
+
+    # Warm-up so the first preset doesn't pay one-off costs
+    summarizer.summarize(samples[0]["text"])
+
+    reports = []
+    for spec in preset_specs:
+        summarizer.map_preset, summarizer.reduce_preset = parse_preset_pair(spec)
+        if "assisted" in (summarizer.map_preset, summarizer.reduce_preset):
+            summarizer.load_draft_model()
+
+        scores = {"rouge1": 0.0, "rouge2": 0.0, "rougeL": 0.0}
+        start = time.perf_counter()
+        for sample in samples:
+            summary = summarizer.summarize(sample["text"])
+            scores["rouge1"] += rouge_n(summary, sample["reference"], 1)
+            scores["rouge2"] += rouge_n(summary, sample["reference"], 2)
+            scores["rougeL"] += rouge_l(summary, sample["reference"])
+        elapsed = time.perf_counter() - start
+
+        report = {
+            "preset": spec,
+            "seconds": elapsed,
+            "seconds_per_sample": elapsed / len(samples),
+        }
+        report.update({name: total / len(samples) for name, total in scores.items()})
+        reports.append(report)
+        logger.info(
+            f"{spec}: {report['seconds_per_sample']:.2f}s/sample "
+            f"R1={report['rouge1']:.3f} R2={report['rouge2']:.3f} RL={report['rougeL']:.3f}"
+        )
+
+    return reports
+
+
+def format_report(reports: List[Dict]) -> str:
+    """Format benchmark reports as a table, with speedup relative to the first row."""
+    baseline = reports[0]["seconds"] if reports else 0
+    lines = [f"{'preset':<20} {'s/sample':>9} {'speedup':>8} {'ROUGE-1':>8} {'ROUGE-2':>8} {'ROUGE-L':>8}"]
+    for r in reports:
+        speedup = baseline / r["seconds"] if r["seconds"] else 0.0
+        lines.append(
+            f"{r['preset']:<20} {r['seconds_per_sample']:>9.2f} {speedup:>7.2f}x "
+            f"{r['rouge1']:>8.3f} {r['rouge2']:>8.3f} {r['rougeL']:>8.3f}"
+        )
+    return "\n".join(lines)
+
+
+def save_report(reports: List[Dict], path: str):
+    """Write benchmark reports as JSON."""
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(reports, indent=2), encoding="utf-8")
+
+
+# In[ ]:
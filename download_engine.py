@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+"""
+Async Download Engine Module
+
+Runs YouTube downloads concurrently with a concurrency cap, a token-bucket
+rate limit and exponential-backoff retries for transient failures.
+"""
+
+import asyncio
+import functools
+import logging
+import random
+import time
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional, Tuple, Union
+
+from downloader import PermanentDownloadError, TransientDownloadError, YouTubeDownloader
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (default: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncDownloadEngine:
+    """Downloads audio for many URLs concurrently."""
+
+    def __init__(
+        self,
+        downloader: YouTubeDownloader,
+        max_concurrency: int = 2,
+        rate_limit: Optional[float] = None,
+        max_retries: int = 3,
+        backoff_base: float = 2.0,
+        backoff_max: float = 60.0,
+    ):
+        """
+        Initialize the download engine.
+
+        Args:
+            downloader: Downloader used for each individual video
+            max_concurrency: Maximum number of downloads in flight
+            rate_limit: Maximum download starts per second (None for unlimited)
+            max_retries: Retries per video for transient failures
+            backoff_base: Delay before the first retry, doubled on each retry (seconds)
+            backoff_max: Upper bound on the retry delay (seconds)
+
+        Raises:
+            ValueError: If max_concurrency is below 1 or max_retries is negative
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+
+        self.downloader = downloader
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._semaphore = None
+
+    async def download(self, url: str, video_id: Optional[str] = None) -> str:
+        """
+        Download audio for one URL, retrying transient failures.
+
+        Args:
+            url: YouTube video URL
+            video_id: Optional video ID for naming the file
+
+        Returns:
+            Path to the downloaded audio file
+
+        Raises:
+            TransientDownloadError: If retries were exhausted
+            PermanentDownloadError: If the download cannot succeed
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        loop = asyncio.get_running_loop()
+        attempt = 0
+
+        while True:
+            if self.bucket is not None:
+                await self.bucket.acquire()
+
+            try:
+                async with self._semaphore:
+                    # Partial files are kept between attempts, so retries resume
+                    return await loop.run_in_executor(
+                        None, functools.partial(self.downloader.download_audio, url, video_id)
+                    )
+            except TransientDownloadError as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"Giving up on {url} after {attempt + 1} attempts")
+                    raise
+
+                delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+                delay *= random.uniform(0.5, 1.0)
+                attempt += 1
+                logger.warning(
+                    f"Transient error for {url} ({str(e)}); "
+                    f"retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+            except PermanentDownloadError:
+                raise
+
+    async def iter_downloads(
+        self, urls: Union[Iterable[str], AsyncIterable[str]], prefetch: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, Optional[str], Optional[Exception]]]:
+        """
+        Download many URLs, yielding each as soon as it finishes.
+
+        URLs that point at the same video (repeats, or youtu.be and
+        watch?v= forms of one ID) are downloaded once; later ones are
+        skipped, since they would share the same partial and audio files.
+        At most `prefetch` downloads are started ahead of the consumer, so a
+        slow consumer does not fill the disk with waiting audio files.
+
+        Args:
+            urls: YouTube video URLs, or an async iterable of URLs that
+                arrive over time (finished downloads are yielded while
+                waiting for the next one)
+            prefetch: Downloads allowed ahead of the consumer
+                (default: twice the concurrency cap)
+
+        Yields:
+            (url, audio_path, error) tuples in completion order; exactly
+            one of audio_path and error is set
+        """
+        prefetch = prefetch or self.max_concurrency * 2
+        source = self._unique_by_video_id(urls)
+        pending = {}
+        fetching = None
+
+        def fetch_next():
+            nonlocal fetching
+            if fetching is None and source is not None and len(pending) < prefetch:
+                fetching = asyncio.ensure_future(source.__anext__())
+
+        fetch_next()
+        try:
+            while pending or fetching is not None:
+                waiting = set(pending)
+                if fetching is not None:
+                    waiting.add(fetching)
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+                if fetching in done:
+                    task, fetching = fetching, None
+                    try:
+                        url, video_id = task.result()
+                    except StopAsyncIteration:
+                        source = None
+                    else:
+                        pending[asyncio.ensure_future(self.download(url, video_id))] = url
+                    fetch_next()
+
+                for task in done:
+                    if task not in pending:
+                        continue
+                    url = pending.pop(task)
+                    error = task.exception()
+                    yield url, (None if error else task.result()), error
+                    fetch_next()
+        finally:
+            for task in pending:
+                task.cancel()
+            if fetching is not None:
+                fetching.cancel()
+
+    async def download_many(self, urls: List[str]) -> List[Tuple[str, Optional[str], Optional[Exception]]]:
+        """
+        Download many URLs and return all results.
+
+        Args:
+            urls: YouTube video URLs
+
+        Returns:
+            List of (url, audio_path, error) tuples in completion order
+        """
+        return [item async for item in self.iter_downloads(urls, prefetch=len(urls))]
+
+    async def _unique_by_video_id(
+        self, urls: Union[Iterable[str], AsyncIterable[str]]
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """Yield (url, video_id) pairs, keeping the first URL for each video ID."""
+        seen = {}
+        async for url in _aiter_urls(urls):
+            video_id = self.downloader.extract_video_id(url)
+            if video_id in seen:
+                logger.info(f"Skipping duplicate URL {url} (same video as {seen[video_id]})")
+                continue
+            seen[video_id] = url
+            yield url, video_id
+
+
+async def _aiter_urls(urls: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    """Iterate over a plain or async iterable of URLs."""
+    if hasattr(urls, "__aiter__"):
+        async for url in urls:
+            yield url
+    else:
+        for url in urls:
+            yield url
+
+
+# In[ ]:
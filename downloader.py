@@ -10,6 +10,7 @@ YouTube Audio Downloader Module
 This module handles downloading audio from YouTube videos using yt-dlp.
 """
 import os
+import re
 import logging
 from pathlib import Path
 from typing import Optional
@@ -17,6 +18,50 @@ import yt_dlp
 
 logger = logging.getLogger(__name__)
 
+# Error messages worth retrying: throttling, server errors and network blips
+TRANSIENT_ERROR_PATTERNS = [
+    r"HTTP Error (408|429|5\d\d)",
+    r"timed out",
+    r"Connection (reset|refused|aborted)",
+    r"Temporary failure in name resolution",
+    r"IncompleteRead",
+    r"Remote end closed connection",
+    r"EOF occurred in violation of protocol",
+]
+
+
+class DownloadError(Exception):
+    """Raised when audio cannot be downloaded."""
+
+
+class TransientDownloadError(DownloadError):
+    """Download failure that may succeed if retried (throttling, network errors)."""
+
+
+class PermanentDownloadError(DownloadError):
+    """Download failure that will not succeed on retry (unavailable video, bad URL)."""
+
+
+def classify_download_error(error: Exception) -> type:
+    """
+    Decide whether a download failure is worth retrying.
+
+    Args:
+        error: Exception raised while downloading
+
+    Returns:
+        TransientDownloadError or PermanentDownloadError
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return TransientDownloadError
+
+    message = str(error)
+    for pattern in TRANSIENT_ERROR_PATTERNS:
+        if re.search(pattern, message, re.IGNORECASE):
+            return TransientDownloadError
+
+    return PermanentDownloadError
+
 
 class YouTubeDownloader:
     """Downloads audio from YouTube videos."""
@@ -43,12 +88,21 @@ class YouTubeDownloader:
             Path to the downloaded audio file
 
         Raises:
-            Exception: If download fails
+            TransientDownloadError: If the download failed but may succeed on retry
+            PermanentDownloadError: If the download cannot succeed
         """
         try:
             # Extract video ID if not provided
             if video_id is None:
-                video_id = self._extract_video_id(url)
+                video_id = self.extract_video_id(url)
+
+            # Reuse audio finished by an earlier attempt. Interrupted downloads
+            # resume on retry because yt-dlp keeps and continues .part files
+            # by default
+            audio_file = self.output_dir / f"{video_id}.wav"
+            if audio_file.exists():
+                logger.info(f"Audio already downloaded: {audio_file}")
+                return str(audio_file)
 
             output_path = self.output_dir / f"{video_id}.%(ext)s"
 
@@ -88,7 +142,9 @@ class YouTubeDownloader:
 
                 if not audio_file.exists():
                     # Try to find any audio file with the video_id
-                    audio_files = list(self.output_dir.glob(f"{video_id}.*"))
+                    audio_files = [
+                        f for f in self.output_dir.glob(f"{video_id}.*") if f.suffix != ".part"
+                    ]
                     if audio_files:
                         audio_file = audio_files[0]
                     else:
@@ -101,9 +157,10 @@ class YouTubeDownloader:
 
         except Exception as e:
             logger.error(f"Error downloading audio: {str(e)}")
-            raise Exception(f"Failed to download audio from YouTube: {str(e)}")
+            error_class = classify_download_error(e)
+            raise error_class(f"Failed to download audio from YouTube: {str(e)}") from e
 
-    def _extract_video_id(self, url: str) -> str:
+    def extract_video_id(self, url: str) -> str:
         """
         Extract video ID from YouTube URL.
 
@@ -113,7 +170,6 @@ class YouTubeDownloader:
         Returns:
             Video ID
         """
-        import re
         import hashlib
 
         patterns = [
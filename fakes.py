@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+"""
+Fake Pipeline Components Module
+
+Stand-ins for YouTubeDownloader, Transcriber and Summarizer with synthetic
+latency, output size and failure rates, for load testing the pipeline
+orchestration without network access, models or a GPU. Behaviour is
+deterministic for a given seed.
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from downloader import TransientDownloadError, YouTubeDownloader
+from low_memory import MemoryBudget, SpillFile
+
+logger = logging.getLogger(__name__)
+
+# Vocabulary for synthetic transcripts
+WORDS = (
+    "the model audio video summary data network signal pipeline result "
+    "speech text time system process stream value output input batch"
+).split()
+
+
+class FakeStage:
+    """Synthetic latency and failures for one fake pipeline stage."""
+
+    def __init__(self, name: str, latency: float = 0.0, jitter: float = 0.5, failure_rate: float = 0.0, seed: int = 0):
+        """
+        Initialize the fake stage.
+
+        Args:
+            name: Stage name, mixed into the random seed
+            latency: Mean seconds per call
+            jitter: Latency varies uniformly by +/- this fraction
+            failure_rate: Probability that a call fails
+            seed: Seed for reproducible runs
+        """
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self._attempts = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: str) -> random.Random:
+        """
+        Simulate one call: sleep, then maybe fail.
+
+        Repeated calls for the same key draw fresh values, so retried
+        failures can succeed, but the sequence is identical between runs.
+
+        Args:
+            key: Identifier of the item being processed
+
+        Returns:
+            Seeded random generator for producing the call's output
+
+        Raises:
+            RuntimeError: If the call is chosen to fail
+        """
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+
+        rng = random.Random(zlib.crc32(f"{self.seed}:{self.name}:{key}:{attempt}".encode()))
+        delay = self.latency * (1 + self.jitter * rng.uniform(-1, 1))
+        if delay > 0:
+            time.sleep(delay)
+
+        if rng.random() < self.failure_rate:
+            raise RuntimeError(f"Synthetic {self.name} failure for {key} (attempt {attempt + 1})")
+        return rng
+
+
+class FakeOptions:
+    """Settings for a fake pipeline."""
+
+    # Keys accepted by from_spec, with their defaults
+    DEFAULTS = {
+        "download_latency": 0.05,
+        "transcribe_latency": 0.02,
+        "summarize_latency": 0.01,
+        "jitter": 0.5,
+        "download_failure_rate": 0.0,
+        "transcribe_failure_rate": 0.0,
+        "summarize_failure_rate": 0.0,
+        "audio_kb": 64,
+        "transcript_words": 2000,
+        "summary_words": 100,
+        "seed": 0,
+    }
+
+    def __init__(self, **settings):
+        """
+        Initialize fake pipeline settings.
+
+        Args:
+            **settings: Any of the keys in DEFAULTS
+        """
+        unknown = set(settings) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown fake settings: {', '.join(sorted(unknown))}")
+
+        values = dict(self.DEFAULTS, **settings)
+        for key, value in values.items():
+            setattr(self, key, value)
+
+        seed = int(self.seed)
+        self.download = FakeStage("download", self.download_latency, self.jitter, self.download_failure_rate, seed)
+        self.transcribe = FakeStage("transcribe", self.transcribe_latency, self.jitter, self.transcribe_failure_rate, seed)
+        self.summarize = FakeStage("summarize", self.summarize_latency, self.jitter, self.summarize_failure_rate, seed)
+
+    @classmethod
+    def from_spec(cls, spec: Optional[str]) -> "FakeOptions":
+        """
+        Build settings from a 'key=value,...' string.
+
+        Args:
+            spec: e.g. 'download_latency=0.5,download_failure_rate=0.1' (empty for defaults)
+
+        Returns:
+            FakeOptions instance
+        """
+        settings = {}
+        for item in (spec or "").split(","):
+            if not item.strip():
+                continue
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise ValueError(f"Fake setting '{item}' must be key=value")
+            key = key.strip()
+            settings[key] = type(cls.DEFAULTS.get(key, 0.0))(value.strip())
+        return cls(**settings)
+
+
+class FakeDownloader(YouTubeDownloader):
+    """Writes synthetic audio files instead of downloading."""
+
+    def __init__(self, output_dir: str = "downloads", options: Optional[FakeOptions] = None):
+        """
+        Initialize the fake downloader.
+
+        Args:
+            output_dir: Directory to write fake audio files to
+            options: Fake pipeline settings
+        """
+        super().__init__(output_dir=output_dir)
+        self.options = options or FakeOptions()
+
+    def download_audio(self, url: str, video_id: Optional[str] = None) -> str:
+        """Simulate a download and write a file of the configured size."""
+        if video_id is None:
+            video_id = self.extract_video_id(url)
+
+        try:
+            self.options.download.run(video_id)
+        except RuntimeError as e:
+            raise TransientDownloadError(str(e))
+
+        audio_file = self.output_dir / f"{video_id}.wav"
+        audio_file.write_bytes(b"\0" * (int(self.options.audio_kb) * 1024))
+        return str(audio_file)
+
+
+class FakeTranscriber:
+    """Returns synthetic transcripts with segment timestamps."""
+
+    def __init__(self, options: Optional[FakeOptions] = None):
+        """
+        Initialize the fake transcriber.
+
+        Args:
+            options: Fake pipeline settings
+        """
+        self.options = options or FakeOptions()
+        self.model = None
+        self.num_threads = None
+        self.cpu_affinity = None
+
+    def load_model(self):
+        """No model to load."""
+
+    def transcribe(self, audio_path: str, language: Optional[str] = None, task: str = "transcribe") -> str:
+        """Return a synthetic transcript."""
+        return self.transcribe_segments(audio_path)["text"]
+
+    def transcribe_segments(self, audio_path: str, language: Optional[str] = None, task: str = "transcribe") -> Dict:
+        """Return a synthetic transcript split into timed segments."""
+        rng = self.options.transcribe.run(Path(audio_path).stem)
+        segments = self._segments(rng)
+        return {"text": " ".join(seg["text"] for seg in segments), "segments": segments}
+
+    def transcribe_windowed(
+        self,
+        audio_path: str,
+        segments: SpillFile,
+        window_seconds: float = 600.0,
+        budget: Optional[MemoryBudget] = None,
+        language: Optional[str] = None,
+        task: str = "transcribe",
+    ):
+        """Spill synthetic segments to disk."""
+        rng = self.options.transcribe.run(Path(audio_path).stem)
+        if budget is not None:
+            budget.check("transcription")
+        for seg in self._segments(rng):
+            segments.append(seg)
+        segments.close()
+
+    def _segments(self, rng: random.Random) -> List[Dict]:
+        """Generate segments of about 12 words, 4 seconds each."""
+        words = [rng.choice(WORDS) for _ in range(int(self.options.transcript_words))]
+        return [
+            {"start": i / 3.0, "end": (i + 12) / 3.0, "text": " ".join(words[i:i + 12])}
+            for i in range(0, len(words), 12)
+        ]
+
+
+class FakeSummarizer:
+    """Returns synthetic summaries."""
+
+    def __init__(self, options: Optional[FakeOptions] = None):
+        """
+        Initialize the fake summarizer.
+
+        Args:
+            options: Fake pipeline settings
+        """
+        self.options = options or FakeOptions()
+        self.summarizer_pipeline = None
+        self.num_threads = None
+        self.cpu_affinity = None
+
+    def load_model(self):
+        """No model to load."""
+
+    def summarize(self, text: str, max_length: Optional[int] = None, min_length: Optional[int] = None) -> str:
+        """Return a synthetic summary built from the input's words."""
+        if not text or len(text.strip()) == 0:
+            raise ValueError("Input text is empty")
+        rng = self.options.summarize.run(str(zlib.crc32(text.encode())))
+        words = text.split()
+        return " ".join(rng.choice(words) for _ in range(int(self.options.summary_words)))
+
+    def summarize_spilled(
+        self,
+        segments: SpillFile,
+        spill_dir: Path,
+        budget: Optional[MemoryBudget] = None,
+        max_length: Optional[int] = None,
+        min_length: Optional[int] = None,
+    ) -> str:
+        """Return a synthetic summary of a spilled transcript."""
+        if budget is not None:
+            budget.check("summarization")
+        return self.summarize(" ".join(seg["text"] for seg in segments))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th percentile of values (nearest rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# In[ ]:
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+"""
+Generation Presets Module
+
+Summarization generation settings, kept free of torch/transformers imports
+so the CLI can list and validate them without loading the model stack.
+"""
+
+# Generation settings passed to the pipeline. "full" keeps the model's own
+# defaults (4 beams for bart-large-cnn); "assisted" drafts tokens with a
+# small model and verifies them with the main one (greedy only).
+GENERATION_PRESETS = {
+    "full": {},
+    "beams2": {"num_beams": 2, "early_stopping": True},
+    "short": {"num_beams": 2, "length_penalty": 0.6, "early_stopping": True, "no_repeat_ngram_size": 3},
+    "greedy": {"num_beams": 1},
+    "assisted": {"num_beams": 1},
+}
+
+DEFAULT_DRAFT_MODEL = "sshleifer/distilbart-cnn-12-6"
+
+
+# In[ ]:
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+"""
+Local Media Module
+
+This module finds already-downloaded media files on disk and deduplicates
+them by an acoustic fingerprint, so mirrors and re-uploads of the same
+video (including re-encoded copies) are only processed once.
+"""
+
+import hashlib
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MEDIA_EXTENSIONS = {
+    ".wav", ".mp3", ".m4a", ".aac", ".flac", ".ogg", ".opus", ".wma",
+    ".mp4", ".mkv", ".webm", ".mov", ".avi", ".flv",
+}
+
+# Only the start of each file is decoded, at a low sample rate
+FINGERPRINT_SECONDS = 120
+FINGERPRINT_SAMPLE_RATE = 8000
+FRAME_SIZE = 4096
+HOP_SIZE = 2048
+
+# Log-spaced band edges (Hz); 17 bands give 16 bits per frame
+BAND_EDGES = np.geomspace(300, 3000, 18)
+
+# Two files match if their durations agree within this many seconds and
+# at most this fraction of fingerprint bits differ
+DURATION_TOLERANCE = 2.0
+MAX_BIT_ERROR_RATE = 0.2
+
+
+class AudioFingerprint:
+    """Coarse acoustic fingerprint: duration plus band-energy trend bits."""
+
+    def __init__(self, duration: float, bits: np.ndarray):
+        """
+        Initialize the fingerprint.
+
+        Args:
+            duration: Media duration in seconds
+            bits: Boolean array of shape (frames, 16)
+        """
+        self.duration = duration
+        self.bits = bits
+
+    @property
+    def usable(self) -> bool:
+        """Whether the fingerprint carries any signal (not empty or all-silent)."""
+        return bool(self.bits.any())
+
+    def video_id(self, file_path: Path) -> str:
+        """
+        Short ID for a kept file.
+
+        The bits alone are not unique (recordings that open with the same
+        audio share them), so the resolved path and duration are hashed in.
+
+        Args:
+            file_path: Path of the file the fingerprint belongs to
+
+        Returns:
+            12-character hex ID
+        """
+        digest = hashlib.sha1()
+        digest.update(str(Path(file_path).resolve()).encode("utf-8"))
+        digest.update(f"|{self.duration:.3f}|".encode("utf-8"))
+        digest.update(np.packbits(self.bits).tobytes())
+        return digest.hexdigest()[:12]
+
+    def matches(self, other: "AudioFingerprint") -> bool:
+        """
+        Check whether two fingerprints come from the same recording.
+
+        Fingerprints without signal (too short or silent openings) never
+        match, since there is nothing to compare.
+
+        Args:
+            other: Fingerprint to compare with
+
+        Returns:
+            True if durations agree and the bit error rate is low enough
+        """
+        if not (self.usable and other.usable):
+            return False
+
+        if abs(self.duration - other.duration) > DURATION_TOLERANCE:
+            return False
+
+        frames = min(len(self.bits), len(other.bits))
+        errors = np.count_nonzero(self.bits[:frames] != other.bits[:frames])
+        return errors / self.bits[:frames].size <= MAX_BIT_ERROR_RATE
+
+
+class LocalMediaSource:
+    """Collects and deduplicates local audio/video files."""
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Initialize the local media source.
+
+        Args:
+            workers: Number of files to fingerprint in parallel (None for default)
+        """
+        self.workers = workers
+
+    def collect(self, paths: Iterable[str]) -> List[Path]:
+        """
+        Expand files and directories into a list of media files.
+
+        Directories are searched recursively for known media extensions.
+
+        Args:
+            paths: File or directory paths
+
+        Returns:
+            Sorted list of media file paths
+
+        Raises:
+            FileNotFoundError: If a path does not exist
+        """
+        files = set()
+        for path in paths:
+            path = Path(path)
+            if path.is_dir():
+                for candidate in path.rglob("*"):
+                    if candidate.is_file() and candidate.suffix.lower() in MEDIA_EXTENSIONS:
+                        files.add(candidate.resolve())
+            elif path.is_file():
+                files.add(path.resolve())
+            else:
+                raise FileNotFoundError(f"Input not found: {path}")
+
+        return sorted(files)
+
+    def fingerprint(self, file_path: Path) -> AudioFingerprint:
+        """
+        Compute the acoustic fingerprint of a media file.
+
+        The first FINGERPRINT_SECONDS are decoded to 8 kHz mono, split into
+        overlapping frames, and each frame is reduced to 16 bits: whether the
+        energy difference between adjacent frequency bands rose or fell since
+        the previous frame. These bits survive re-encoding and bitrate changes.
+
+        Args:
+            file_path: Path to the media file
+
+        Returns:
+            AudioFingerprint for the file
+
+        Raises:
+            RuntimeError: If FFmpeg/FFprobe fail to read the file
+        """
+        duration = self._probe_duration(file_path)
+
+        cmd = [
+            "ffmpeg", "-nostdin", "-v", "error",
+            "-i", str(file_path),
+            "-map", "0:a:0",
+            "-t", str(FINGERPRINT_SECONDS),
+            "-ac", "1",
+            "-ar", str(FINGERPRINT_SAMPLE_RATE),
+            "-f", "f32le", "-",
+        ]
+        result = subprocess.run(cmd, capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Failed to decode {file_path}: {result.stderr.decode(errors='replace').strip()}"
+            )
+
+        samples = np.frombuffer(result.stdout, dtype=np.float32)
+        return AudioFingerprint(duration, self._fingerprint_bits(samples))
+
+    def scan(self, paths: Iterable[str]) -> Tuple[List[Tuple[str, Path]], List[Path]]:
+        """
+        Collect media files and drop duplicates by acoustic fingerprint.
+
+        Args:
+            paths: File or directory paths
+
+        Returns:
+            (unique, unreadable): unique is a list of (video_id, file_path)
+            pairs, one per distinct recording, with a video ID unique to each
+            kept file; unreadable lists files that could not be
+            fingerprinted
+        """
+        files = self.collect(paths)
+        logger.info(f"Fingerprinting {len(files)} local media files")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            fingerprints = list(executor.map(self._safe_fingerprint, files))
+
+        unique = []
+        unreadable = []
+        # Kept fingerprints bucketed by rounded duration, to limit comparisons
+        buckets: Dict[int, List[Tuple[AudioFingerprint, Path]]] = {}
+
+        for file_path, fp in zip(files, fingerprints):
+            if fp is None:
+                unreadable.append(file_path)
+                continue
+
+            if not fp.usable:
+                logger.info(f"No usable fingerprint for {file_path}; not deduplicating it")
+                unique.append((fp.video_id(file_path), file_path))
+                continue
+
+            bucket = int(round(fp.duration))
+            nearby = range(bucket - int(DURATION_TOLERANCE) - 1, bucket + int(DURATION_TOLERANCE) + 2)
+            original = next(
+                (path for b in nearby for kept, path in buckets.get(b, []) if fp.matches(kept)),
+                None,
+            )
+            if original is not None:
+                logger.info(f"Skipping duplicate: {file_path} (same audio as {original})")
+                continue
+
+            buckets.setdefault(bucket, []).append((fp, file_path))
+            unique.append((fp.video_id(file_path), file_path))
+
+        logger.info(f"{len(unique)} unique of {len(files)} local media files")
+        return unique, unreadable
+
+    def _probe_duration(self, file_path: Path) -> float:
+        """Return the media duration in seconds, using FFprobe."""
+        cmd = [
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            str(file_path),
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        try:
+            return float(result.stdout.strip())
+        except ValueError:
+            raise RuntimeError(f"Failed to read duration of {file_path}: {result.stderr.strip()}")
+
+    def _fingerprint_bits(self, samples: np.ndarray) -> np.ndarray:
+        """Compute band-energy trend bits, shape (frames - 1, 16), from samples."""
+        if len(samples) < FRAME_SIZE:
+            return np.zeros((0, len(BAND_EDGES) - 2), dtype=bool)
+
+        frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_SIZE)[::HOP_SIZE]
+        spectrum = np.abs(np.fft.rfft(frames * np.hanning(FRAME_SIZE), axis=1)) ** 2
+
+        freqs = np.fft.rfftfreq(FRAME_SIZE, 1 / FINGERPRINT_SAMPLE_RATE)
+        band_index = np.digitize(freqs, BAND_EDGES) - 1
+        energies = np.stack(
+            [spectrum[:, band_index == b].sum(axis=1) for b in range(len(BAND_EDGES) - 1)],
+            axis=1,
+        )
+
+        band_diff = energies[:, :-1] - energies[:, 1:]
+        return (band_diff[1:] - band_diff[:-1]) > 0
+
+    def _safe_fingerprint(self, file_path: Path) -> Optional[AudioFingerprint]:
+        """Fingerprint a file, logging and returning None on failure."""
+        try:
+            return self.fingerprint(file_path)
+        except Exception as e:
+            logger.warning(f"Cannot read {file_path}: {str(e)}")
+            return None
+
+
+# In[ ]:
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+"""
+Low-Memory Processing Module
+
+Helpers for processing long recordings within a fixed memory budget:
+decoded audio is kept in a raw file on disk and read window by window,
+and intermediate results are spilled to JSONL files on disk.
+"""
+
+import gc
+import json
+import logging
+import resource
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Whisper expects 16 kHz mono float32 audio
+SAMPLE_RATE = 16000
+
+
+def _read_proc_status_mb(field: str) -> Optional[float]:
+    """Read a memory field (in kB) from /proc/self/status, in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process, in MB."""
+    peak = _read_proc_status_mb("VmHWM")
+    if peak is not None:
+        return peak
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kB elsewhere
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def current_rss_mb() -> float:
+    """Return the current resident set size of this process, in MB."""
+    rss = _read_proc_status_mb("VmRSS")
+    return rss if rss is not None else peak_rss_mb()
+
+
+def anon_rss_mb() -> float:
+    """
+    Return the anonymous (heap) part of the resident set, in MB.
+
+    Unlike total RSS this excludes file-backed pages such as mapped model
+    weights, which the OS can drop under pressure. Falls back to total RSS
+    where /proc is unavailable.
+    """
+    rss = _read_proc_status_mb("RssAnon")
+    return rss if rss is not None else current_rss_mb()
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """Raised when the process grows beyond its configured memory budget."""
+
+
+class MemoryBudget:
+    """Checks process memory against a limit at pipeline checkpoints."""
+
+    def __init__(self, max_rss_mb: float):
+        """
+        Initialize the memory budget.
+
+        Args:
+            max_rss_mb: Maximum anonymous resident memory in MB (see anon_rss_mb)
+        """
+        self.max_rss_mb = max_rss_mb
+
+    def check(self, stage: str):
+        """
+        Verify the process is within budget.
+
+        Args:
+            stage: Name of the current stage, for the error message
+
+        Raises:
+            MemoryBudgetExceeded: If memory is over budget even after garbage collection
+        """
+        rss = anon_rss_mb()
+        if rss <= self.max_rss_mb:
+            return
+
+        gc.collect()
+        rss = anon_rss_mb()
+        if rss > self.max_rss_mb:
+            raise MemoryBudgetExceeded(
+                f"{stage}: anonymous RSS {rss:.0f} MB exceeds memory budget of {self.max_rss_mb:.0f} MB"
+            )
+
+
+def decode_to_file(audio_path: str, pcm_path: Path) -> int:
+    """
+    Decode audio once to a raw float32 file on disk.
+
+    FFmpeg writes straight to disk, so the full recording is never held
+    in memory.
+
+    Args:
+        audio_path: Path to the source audio/video file
+        pcm_path: Where to write the decoded 16 kHz mono float32 samples
+
+    Returns:
+        Number of samples written
+
+    Raises:
+        RuntimeError: If FFmpeg fails to decode the file
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error", "-y",
+        "-i", str(audio_path),
+        "-ac", "1",
+        "-ar", str(SAMPLE_RATE),
+        "-f", "f32le", str(pcm_path),
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to decode {audio_path}: {result.stderr.strip()}")
+
+    return pcm_path.stat().st_size // 4
+
+
+def _read_samples(pcm_path: Path, start: int, count: int) -> np.ndarray:
+    """Read `count` float32 samples starting at sample `start`."""
+    return np.fromfile(pcm_path, dtype=np.float32, count=count, offset=start * 4)
+
+
+def _quietest_point(samples: np.ndarray, start: int, frame: int) -> int:
+    """Return the index of the middle of the lowest-energy frame in samples[start:]."""
+    region = samples[start:]
+    num_frames = len(region) // frame
+    if num_frames == 0:
+        return len(samples)
+
+    energy = np.square(region[: num_frames * frame].reshape(num_frames, frame)).mean(axis=1)
+    return start + int(energy.argmin()) * frame + frame // 2
+
+
+def iter_audio_windows(
+    pcm_path: Path, window_seconds: float = 600.0, search_seconds: float = 2.0
+) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Read a raw float32 file in windows, cutting at the quietest point near each boundary.
+
+    Each window is read from disk on its own with ordinary file reads, so
+    only one window is resident at a time (pages the OS keeps in its file
+    cache are not charged to the process).
+
+    Args:
+        pcm_path: File written by decode_to_file
+        window_seconds: Target window length
+        search_seconds: How far before each boundary to look for a pause
+
+    Yields:
+        (offset_seconds, window_samples) pairs
+
+    Raises:
+        ValueError: If window_seconds is not positive
+    """
+    if window_seconds <= 0:
+        raise ValueError(f"window_seconds must be positive, got {window_seconds}")
+
+    total = Path(pcm_path).stat().st_size // 4
+    # At least one sample, so every pass makes progress
+    window = max(1, int(window_seconds * SAMPLE_RATE))
+    search = min(int(search_seconds * SAMPLE_RATE), window // 2)
+    frame = int(0.02 * SAMPLE_RATE)
+
+    start = 0
+    while start < total:
+        samples = _read_samples(pcm_path, start, min(window, total - start))
+        length = len(samples)
+        if start + length < total and search > 0:
+            length = _quietest_point(samples, length - search, frame)
+
+        yield start / SAMPLE_RATE, samples[:length]
+        start += length
+
+
+class SpillFile:
+    """Append-only JSONL file for intermediate records streamed back from disk."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize the spill file.
+
+        Args:
+            path: JSONL file to write (truncated if it exists)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("", encoding="utf-8")
+        self.count = 0
+        self.chars = 0
+        self._file = None
+
+    def append(self, record: Dict):
+        """
+        Append one record.
+
+        Args:
+            record: JSON-serializable dict; its 'text' length is tracked
+        """
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n")
+        self.count += 1
+        self.chars += len(record.get("text", ""))
+
+    def close(self):
+        """Flush pending writes."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Stream records back from disk."""
+        self.close()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+# In[ ]:
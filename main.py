@@ -11,13 +11,29 @@ This module provides the CLI interface for the YouTube Video Summarizer.
 """
 
 import argparse
+import asyncio
+import functools
+import json
 import logging
+import shutil
+import sqlite3
 import sys
+import tempfile
+import time
+from contextlib import nullcontext
 from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
+from download_engine import AsyncDownloadEngine
 from downloader import YouTubeDownloader
-from transcriber import Transcriber
-from summarizer import Summarizer
+from fakes import FakeDownloader, FakeOptions, FakeSummarizer, FakeTranscriber, percentile
+from local_media import LocalMediaSource
+from low_memory import MemoryBudget, SpillFile, peak_rss_mb
+from generation_presets import DEFAULT_DRAFT_MODEL, GENERATION_PRESETS
+import benchmark
+from result_writer import COMPRESSORS, FORMATS, ResultWriter
+from transcript_index import DEFAULT_INDEX_PATH, TranscriptIndex, format_timestamp
+import tuning
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +52,20 @@ class YouTubeSummarizer:
         summarizer_model: str = "facebook/bart-large-cnn",
         output_dir: str = "downloads",
         cleanup: bool = True,
+        transcribe_threads: Optional[int] = None,
+        summarize_threads: Optional[int] = None,
+        transcribe_cpus: Optional[List[int]] = None,
+        summarize_cpus: Optional[List[int]] = None,
+        download_concurrency: int = 2,
+        download_rate: Optional[float] = None,
+        download_retries: int = 3,
+        low_memory: bool = False,
+        memory_budget_mb: Optional[float] = None,
+        window_seconds: float = 600.0,
+        map_preset: str = "full",
+        reduce_preset: str = "full",
+        draft_model: str = DEFAULT_DRAFT_MODEL,
+        fake: Optional[FakeOptions] = None,
     ):
         """
         Initialize the YouTube summarizer.
@@ -45,11 +75,55 @@ class YouTubeSummarizer:
             summarizer_model: Hugging Face model for summarization
             output_dir: Directory for temporary downloads
             cleanup: Whether to cleanup downloaded files after processing
+            transcribe_threads: Torch thread budget for transcription
+            summarize_threads: Torch thread budget for summarization
+            transcribe_cpus: Optional CPU ids to pin transcription to
+            summarize_cpus: Optional CPU ids to pin summarization to
+            download_concurrency: Maximum downloads in flight in batch mode
+            download_rate: Maximum download starts per second (None for unlimited)
+            download_retries: Retries per video for transient download errors
+            low_memory: Read decoded audio from disk in windows and spill intermediates to disk
+            memory_budget_mb: Fail a job if process RSS exceeds this many MB
+            window_seconds: Audio held in memory at once in low-memory mode
+            map_preset: Generation preset for per-chunk summaries
+            reduce_preset: Generation preset for the final summary
+            draft_model: Draft model for the 'assisted' preset
+            fake: Use synthetic stand-ins for download, transcription and
+                summarization with these settings (for load testing)
         """
-        self.downloader = YouTubeDownloader(output_dir=output_dir)
-        self.transcriber = Transcriber(model_size=whisper_model)
-        self.summarizer = Summarizer(model_name=summarizer_model)
+        if fake is not None:
+            self.downloader = FakeDownloader(output_dir=output_dir, options=fake)
+            self.transcriber = FakeTranscriber(options=fake)
+            self.summarizer = FakeSummarizer(options=fake)
+        else:
+            # Imported here so fake runs work without torch/transformers
+            from transcriber import Transcriber
+            from summarizer import Summarizer
+
+            self.downloader = YouTubeDownloader(output_dir=output_dir)
+            self.transcriber = Transcriber(
+                model_size=whisper_model,
+                num_threads=transcribe_threads,
+                cpu_affinity=transcribe_cpus,
+            )
+            self.summarizer = Summarizer(
+                model_name=summarizer_model,
+                num_threads=summarize_threads,
+                cpu_affinity=summarize_cpus,
+                map_preset=map_preset,
+                reduce_preset=reduce_preset,
+                draft_model_name=draft_model,
+            )
+        self.download_engine = AsyncDownloadEngine(
+            self.downloader,
+            max_concurrency=download_concurrency,
+            rate_limit=download_rate,
+            max_retries=download_retries,
+        )
         self.cleanup = cleanup
+        self.low_memory = low_memory
+        self.memory_budget = MemoryBudget(memory_budget_mb) if memory_budget_mb else None
+        self.window_seconds = window_seconds
 
     def process_video(self, url: str) -> dict:
         """
@@ -59,49 +133,498 @@ class YouTubeSummarizer:
             url: YouTube video URL
 
         Returns:
-            Dictionary with 'transcript' and 'summary' keys
+            Dictionary with 'transcript', 'segments', 'summary', 'url' and 'video_id' keys
         """
-        audio_path = None
-
+        # Step 1: Download audio
+        logger.info("=" * 60)
+        logger.info("Step 1: Downloading audio from YouTube")
+        logger.info("=" * 60)
         try:
-            # Step 1: Download audio
-            logger.info("=" * 60)
-            logger.info("Step 1: Downloading audio from YouTube")
-            logger.info("=" * 60)
             audio_path = self.downloader.download_audio(url)
+        except Exception as e:
+            logger.error(f"Error processing video: {str(e)}")
+            raise
+
+        return self.process_downloaded(url, audio_path)
+
+    async def aprocess_videos(
+        self, urls: Union[Iterable[str], AsyncIterable[str]]
+    ) -> AsyncIterator[Tuple[str, Optional[dict], Optional[Exception]]]:
+        """
+        Process many YouTube videos, downloading ahead of transcription.
+
+        Downloads run concurrently on the download engine while videos are
+        transcribed and summarized one at a time as their audio arrives.
+
+        Args:
+            urls: YouTube video URLs, or an async iterable of URLs arriving
+                over time
+
+        Yields:
+            (url, result, error) tuples in completion order; exactly one of
+            result and error is set
+        """
+        loop = asyncio.get_running_loop()
+
+        async for url, audio_path, error in self.download_engine.iter_downloads(urls):
+            if error is not None:
+                yield url, None, error
+                continue
+
+            try:
+                result = await loop.run_in_executor(
+                    None, functools.partial(self.process_downloaded, url, audio_path)
+                )
+            except Exception as e:
+                yield url, None, e
+                continue
+            yield url, result, None
+
+    def process_downloaded(self, url: str, audio_path: str) -> dict:
+        """
+        Transcribe and summarize audio already downloaded for a URL.
+
+        Args:
+            url: YouTube video URL the audio came from
+            audio_path: Path to the downloaded audio file
+
+        Returns:
+            Dictionary with 'transcript', 'segments', 'summary', 'url' and 'video_id' keys
+        """
+        try:
+            result = self._transcribe_and_summarize(audio_path)
+            result.update({"url": url, "video_id": self.downloader.extract_video_id(url)})
+            return result
+
+        except Exception as e:
+            logger.error(f"Error processing video: {str(e)}")
+            raise
+
+        finally:
+            if self.cleanup:
+                self.downloader.cleanup(audio_path)
+
+    def process_file(self, file_path: str, video_id: Optional[str] = None) -> dict:
+        """
+        Process a local audio/video file: transcribe and summarize.
+
+        The file is never removed, regardless of the cleanup setting.
+
+        Args:
+            file_path: Path to a local media file
+            video_id: Optional ID for the file (default: the file stem)
+
+        Returns:
+            Dictionary with 'transcript', 'segments', 'summary', 'url' and 'video_id' keys
+        """
+        try:
+            logger.info(f"Processing local file: {file_path}")
+            result = self._transcribe_and_summarize(str(file_path))
+            result.update({"url": str(file_path), "video_id": video_id or Path(file_path).stem})
+            return result
+
+        except Exception as e:
+            logger.error(f"Error processing file: {str(e)}")
+            raise
+
+    def _transcribe_and_summarize(self, audio_path: str) -> dict:
+        """
+        Transcribe an audio file and summarize the transcript.
+
+        Args:
+            audio_path: Path to the audio file
 
+        Returns:
+            Dictionary with 'transcript', 'segments' and 'summary' keys
+        """
+        if self.low_memory:
+            return self._transcribe_and_summarize_low_memory(audio_path)
+
+        # Step 2: Transcribe audio
+        logger.info("=" * 60)
+        logger.info("Step 2: Transcribing audio to text")
+        logger.info("=" * 60)
+        transcription = self.transcriber.transcribe_segments(audio_path)
+        transcript = transcription["text"]
+        if self.memory_budget is not None:
+            self.memory_budget.check("transcription")
+
+        # Step 3: Summarize transcript
+        logger.info("=" * 60)
+        logger.info("Step 3: Summarizing transcript")
+        logger.info("=" * 60)
+        summary = ""
+        if transcript and len(transcript.strip()) > 0:
+            summary = self.summarizer.summarize(transcript)
+        else:
+            logger.warning("Transcript empty — skipping summarization")
+        if self.memory_budget is not None:
+            self.memory_budget.check("summarization")
+
+        logger.info(f"Peak RSS: {peak_rss_mb():.0f} MB")
+        return {"transcript": transcript, "segments": transcription["segments"], "summary": summary}
+
+    def _transcribe_and_summarize_low_memory(self, audio_path: str) -> dict:
+        """
+        Transcribe and summarize with decoded audio and intermediates on disk.
+
+        Args:
+            audio_path: Path to the audio file
+
+        Returns:
+            Dictionary with 'transcript', 'segments' and 'summary' keys
+        """
+        spill_dir = Path(tempfile.mkdtemp(prefix="spill-", dir=self.downloader.output_dir))
+
+        try:
             # Step 2: Transcribe audio
             logger.info("=" * 60)
-            logger.info("Step 2: Transcribing audio to text")
+            logger.info("Step 2: Transcribing audio to text (low memory)")
             logger.info("=" * 60)
-            transcript = self.transcriber.transcribe(audio_path)
+            segments = SpillFile(spill_dir / "segments.jsonl")
+            self.transcriber.transcribe_windowed(
+                audio_path,
+                segments,
+                window_seconds=self.window_seconds,
+                budget=self.memory_budget,
+            )
 
             # Step 3: Summarize transcript
             logger.info("=" * 60)
-            logger.info("Step 3: Summarizing transcript")
+            logger.info("Step 3: Summarizing transcript (low memory)")
             logger.info("=" * 60)
             summary = ""
-            if transcript and len(transcript.strip()) > 0:
-                summary = self.summarizer.summarize(transcript)
+            if segments.chars > 0:
+                summary = self.summarizer.summarize_spilled(
+                    segments, spill_dir, budget=self.memory_budget
+                )
             else:
                 logger.warning("Transcript empty — skipping summarization")
 
-            # Cleanup
-            if self.cleanup and audio_path:
-                self.downloader.cleanup(audio_path)
+            # The final transcript is small next to the audio, so it is
+            # loaded back for output and indexing
+            segment_list = list(segments)
+            transcript = " ".join(seg["text"] for seg in segment_list)
+
+            logger.info(f"Peak RSS: {peak_rss_mb():.0f} MB")
+            return {"transcript": transcript, "segments": segment_list, "summary": summary}
+
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+def validate_download_args(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Reject download settings that would stall or drop every download."""
+    if args.download_concurrency < 1:
+        parser.error("--download-concurrency must be at least 1")
+    if args.download_retries < 0:
+        parser.error("--download-retries must not be negative")
+    if args.download_rate is not None and args.download_rate <= 0:
+        parser.error("--download-rate must be positive")
+
+
+async def run_batch(
+    summarizer: YouTubeSummarizer,
+    urls: List[str],
+    local_files: List[Tuple[str, Path]],
+    on_result: Callable[[dict], None],
+    submitted_at: Optional[Dict[str, float]] = None,
+    arrival_rate: Optional[float] = None,
+) -> int:
+    """
+    Process URLs and local files, continuing past failures.
+
+    Args:
+        summarizer: Pipeline to run
+        urls: YouTube video URLs
+        local_files: (video_id, file_path) pairs from LocalMediaSource.scan
+        on_result: Called with each result as soon as it is ready
+        submitted_at: Optional dict filled with each input's submission time
+            (time.perf_counter(), keyed like result['url'])
+        arrival_rate: Submit URLs open-loop, evenly spaced at this many per
+            second, instead of all at once; each URL's submission time is its
+            scheduled arrival, even if the pipeline is too busy to take it then
+
+    Returns:
+        Number of inputs that failed
+    """
+    start = time.perf_counter()
+    submitted_at = submitted_at if submitted_at is not None else {}
+    submitted_at.update((str(file_path), start) for _, file_path in local_files)
+
+    async def arrivals() -> AsyncIterator[str]:
+        for i, url in enumerate(urls):
+            arrival = start + i / arrival_rate
+            delay = arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            submitted_at[url] = arrival
+            yield url
+
+    if arrival_rate:
+        source = arrivals()
+    else:
+        submitted_at.update((url, start) for url in urls)
+        source = urls
+
+    failed = 0
+
+    async for url, result, error in summarizer.aprocess_videos(source):
+        if error is not None:
+            logger.error(f"Failed to process {url}: {str(error)}")
+            failed += 1
+            continue
+        on_result(result)
+
+    for video_id, file_path in local_files:
+        try:
+            result = summarizer.process_file(file_path, video_id)
+        except Exception as e:
+            logger.error(f"Failed to process {file_path}: {str(e)}")
+            failed += 1
+            continue
+        on_result(result)
 
-            return {"transcript": transcript, "summary": summary, "url": url}
+    return failed
 
-        except Exception as e:
-            logger.error(f"Error processing video: {str(e)}")
-            # Cleanup on error
-            if audio_path and self.cleanup:
-                self.downloader.cleanup(audio_path)
-            raise
+
+def autotune_main(argv: List[str]):
+    """CLI entry point for the 'autotune' command."""
+    parser = argparse.ArgumentParser(
+        prog="main.py autotune",
+        description="Sweep per-stage thread counts on a local sample and record the fastest",
+    )
+    parser.add_argument("sample", type=str, help="Local audio file to benchmark with")
+    parser.add_argument("--whisper-model", type=str, default="base")
+    parser.add_argument("--summarizer-model", type=str, default="facebook/bart-large-cnn")
+    parser.add_argument(
+        "--threads",
+        type=str,
+        default=None,
+        help="Comma-separated thread counts to try (default: powers of two up to CPU count)",
+    )
+    parser.add_argument("--cpus", type=str, default=None, help="CPU list to pin to, e.g. 0-7")
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Runs per thread count; the median time is used (default: 3)",
+    )
+    parser.add_argument(
+        "--tuning-profile",
+        type=str,
+        default=None,
+        help=f"Where to record the result (default: {tuning.DEFAULT_PROFILE_PATH})",
+    )
+    args = parser.parse_args(argv)
+
+    candidates = [int(n) for n in args.threads.split(",")] if args.threads else None
+
+    try:
+        tuning.autotune(
+            args.sample,
+            whisper_model=args.whisper_model,
+            summarizer_model=args.summarizer_model,
+            candidates=candidates,
+            cpus=tuning.parse_cpu_list(args.cpus),
+            profile_path=args.tuning_profile,
+            repeats=args.repeats,
+        )
+    except Exception as e:
+        logger.error(f"Auto-tune failed: {str(e)}")
+        sys.exit(1)
+
+
+def search_main(argv: List[str]):
+    """CLI entry point for the 'search' command."""
+    parser = argparse.ArgumentParser(
+        prog="main.py search",
+        description="Search processed transcripts",
+    )
+    parser.add_argument("query", type=str, help='Search query (words, "phrases", AND/OR/NOT, prefix*)')
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of results (default: 20)")
+    parser.add_argument(
+        "--index",
+        type=str,
+        default=None,
+        help=f"Transcript index path (default: {DEFAULT_INDEX_PATH})",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        index = TranscriptIndex(args.index)
+        hits = index.search(args.query, limit=args.limit)
+        index.close()
+    except Exception as e:
+        logger.error(f"Search failed: {str(e)}")
+        sys.exit(1)
+
+    for hit in hits:
+        print(f"{hit['video_id']}\t{format_timestamp(hit['start'])}\t{hit['snippet']}\t{hit['url']}")
+
+
+def benchmark_main(argv: List[str]):
+    """CLI entry point for the 'benchmark' command."""
+    parser = argparse.ArgumentParser(
+        prog="main.py benchmark",
+        description="Compare summarization presets for speed and ROUGE against reference summaries",
+    )
+    parser.add_argument("samples", type=str, help="JSONL file with 'text' and 'reference' per line")
+    parser.add_argument(
+        "--presets",
+        type=str,
+        default="full,beams2,greedy:full,greedy,assisted",
+        help="Comma-separated presets; 'map:reduce' sets the stages separately. "
+        "Samples of 1024 characters or fewer only use the reduce preset "
+        "(default: full,beams2,greedy:full,greedy,assisted)",
+    )
+    parser.add_argument("--summarizer-model", type=str, default="facebook/bart-large-cnn")
+    parser.add_argument("--draft-model", type=str, default=DEFAULT_DRAFT_MODEL)
+    parser.add_argument("--output", type=str, default=None, help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    preset_specs = [spec.strip() for spec in args.presets.split(",") if spec.strip()]
+    for spec in preset_specs:
+        for preset in benchmark.parse_preset_pair(spec):
+            if preset not in GENERATION_PRESETS:
+                parser.error(f"unknown preset '{preset}', expected one of {', '.join(GENERATION_PRESETS)}")
+
+    try:
+        samples = benchmark.load_samples(args.samples)
+        if not samples:
+            raise ValueError(f"No samples in {args.samples}")
+
+        from summarizer import Summarizer
+
+        summarizer = Summarizer(model_name=args.summarizer_model, draft_model_name=args.draft_model)
+        reports = benchmark.run_benchmark(summarizer, samples, preset_specs)
+    except Exception as e:
+        logger.error(f"Benchmark failed: {str(e)}")
+        sys.exit(1)
+
+    print(benchmark.format_report(reports))
+    if args.output:
+        benchmark.save_report(reports, args.output)
+        logger.info(f"Report saved to: {args.output}")
+
+
+def loadtest_main(argv: List[str]):
+    """CLI entry point for the 'loadtest' command."""
+    parser = argparse.ArgumentParser(
+        prog="main.py loadtest",
+        description="Drive synthetic jobs through the pipeline with fake models and report throughput and latency",
+    )
+    parser.add_argument("--jobs", type=int, default=1000, help="Number of synthetic videos (default: 1000)")
+    parser.add_argument(
+        "--fake-spec",
+        type=str,
+        default="",
+        metavar="SPEC",
+        help="Fake stage settings as key=value,... e.g. download_latency=0.2,download_failure_rate=0.05",
+    )
+    parser.add_argument(
+        "--arrival-rate",
+        type=float,
+        default=None,
+        help="Submit jobs open-loop at this many per second (default: all at once)",
+    )
+    parser.add_argument("--download-concurrency", type=int, default=2)
+    parser.add_argument("--download-rate", type=float, default=None)
+    parser.add_argument("--download-retries", type=int, default=3)
+    parser.add_argument("--low-memory", action="store_true", help="Exercise the low-memory path")
+    parser.add_argument("--output-dir", type=str, default="downloads/loadtest")
+    parser.add_argument("--output", type=str, default=None, help="Also write results as JSONL to this path")
+    parser.add_argument("--index", type=str, default=None, help="Also add results to this search index")
+    parser.add_argument("--report", type=str, default=None, help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+    validate_download_args(parser, args)
+    if args.arrival_rate is not None and args.arrival_rate <= 0:
+        parser.error("--arrival-rate must be positive")
+
+    # Keep per-video pipeline logs out of the report
+    logging.getLogger().setLevel(logging.WARNING)
+
+    try:
+        fake = FakeOptions.from_spec(args.fake_spec)
+    except ValueError as e:
+        parser.error(str(e))
+
+    summarizer = YouTubeSummarizer(
+        output_dir=args.output_dir,
+        download_concurrency=args.download_concurrency,
+        download_rate=args.download_rate,
+        download_retries=args.download_retries,
+        low_memory=args.low_memory,
+        fake=fake,
+    )
+    urls = [f"https://www.youtube.com/watch?v=load{i:07d}" for i in range(args.jobs)]
+    index = TranscriptIndex(args.index) if args.index else None
+    latencies = []
+    submitted_at = {}
+
+    with ResultWriter(output=args.output, fmt="jsonl") if args.output else nullcontext() as writer:
+
+        def handle_result(result: dict):
+            latencies.append(time.perf_counter() - submitted_at[result["url"]])
+            if index is not None:
+                index.add(result)
+            if writer is not None:
+                writer.write(result)
+
+        start = time.perf_counter()
+        failed = asyncio.run(
+            run_batch(summarizer, urls, [], handle_result, submitted_at, args.arrival_rate)
+        )
+        elapsed = time.perf_counter() - start
+
+    if index is not None:
+        index.close()
+
+    report = {
+        "jobs": args.jobs,
+        "arrival_rate": args.arrival_rate,
+        "succeeded": len(latencies),
+        "failed": failed,
+        "seconds": elapsed,
+        "throughput_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p90": percentile(latencies, 90),
+        "latency_p99": percentile(latencies, 99),
+        "latency_max": max(latencies, default=0.0),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    print(f"jobs:       {report['jobs']} ({report['succeeded']} ok, {report['failed']} failed)")
+    if args.arrival_rate:
+        print(f"arrivals:   {args.arrival_rate:g} jobs/s (open loop)")
+    print(f"wall time:  {report['seconds']:.2f}s")
+    print(f"throughput: {report['throughput_per_second']:.1f} jobs/s")
+    print(
+        f"latency:    p50 {report['latency_p50']:.3f}s  p90 {report['latency_p90']:.3f}s  "
+        f"p99 {report['latency_p99']:.3f}s  max {report['latency_max']:.3f}s"
+    )
+    print(f"peak RSS:   {report['peak_rss_mb']:.0f} MB")
+
+    if args.report:
+        report_path = Path(args.report)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+COMMANDS = {
+    "autotune": autotune_main,
+    "search": search_main,
+    "benchmark": benchmark_main,
+    "loadtest": loadtest_main,
+}
 
 
 def main():
     """Main CLI entry point."""
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Offline YouTube Video Summarizer",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -110,10 +633,21 @@ Examples:
   python main.py https://www.youtube.com/watch?v=dQw4w9WgXcQ
   python main.py https://youtu.be/dQw4w9WgXcQ --whisper-model small --no-cleanup
   python main.py https://www.youtube.com/watch?v=dQw4w9WgXcQ --output summary.txt
+  python main.py https://youtu.be/dQw4w9WgXcQ --transcribe-threads 8 --transcribe-cpus 0-7
+  python main.py /mnt/shared/videos/ --format jsonl --output results.jsonl.gz
+  python main.py autotune sample.wav
+  python main.py search "neural networks"
+  python main.py benchmark references.jsonl --presets full,greedy:full,assisted
+  python main.py loadtest --jobs 5000 --download-concurrency 8 --fake-spec download_failure_rate=0.05
         """,
     )
 
-    parser.add_argument("url", type=str, help="YouTube video URL")
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        metavar="INPUT",
+        help="YouTube video URLs, local media files, or directories (searched recursively)",
+    )
 
     parser.add_argument(
         "--whisper-model",
@@ -130,11 +664,50 @@ Examples:
         help="Hugging Face summarization model (default: facebook/bart-large-cnn)",
     )
 
+    parser.add_argument(
+        "--map-preset",
+        type=str,
+        default="full",
+        choices=list(GENERATION_PRESETS),
+        help="Generation preset for per-chunk summaries of long transcripts (default: full)",
+    )
+
+    parser.add_argument(
+        "--reduce-preset",
+        type=str,
+        default="full",
+        choices=list(GENERATION_PRESETS),
+        help="Generation preset for the final summary (default: full)",
+    )
+
+    parser.add_argument(
+        "--draft-model",
+        type=str,
+        default=DEFAULT_DRAFT_MODEL,
+        help=f"Draft model for the 'assisted' preset (default: {DEFAULT_DRAFT_MODEL})",
+    )
+
     parser.add_argument(
         "--output",
         type=str,
         default=None,
-        help="Output file path for summary (default: print to stdout)",
+        help="Output file path for summary, or directory for --format json (default: print to stdout)",
+    )
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        default="text",
+        choices=FORMATS,
+        help="Output format: human-readable text, one JSON file per video, or a JSONL stream (default: text)",
+    )
+
+    parser.add_argument(
+        "--compress",
+        type=str,
+        default=None,
+        choices=sorted(COMPRESSORS),
+        help="Compress output files (default: inferred from --output suffix)",
     )
 
     parser.add_argument(
@@ -156,62 +729,212 @@ Examples:
         help="Only transcribe, do not summarize",
     )
 
+    parser.add_argument(
+        "--index",
+        type=str,
+        default=None,
+        help=f"Transcript search index to add results to (default: {DEFAULT_INDEX_PATH})",
+    )
+
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Do not add results to the transcript search index",
+    )
+
+    parser.add_argument(
+        "--download-concurrency",
+        type=int,
+        default=2,
+        help="Maximum downloads in flight (default: 2)",
+    )
+
+    parser.add_argument(
+        "--download-rate",
+        type=float,
+        default=None,
+        help="Maximum download starts per second (default: unlimited)",
+    )
+
+    parser.add_argument(
+        "--download-retries",
+        type=int,
+        default=3,
+        help="Retries per video for transient download errors (default: 3)",
+    )
+
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Decode audio to disk, transcribe it in windows and spill intermediates to disk",
+    )
+
+    parser.add_argument(
+        "--window-seconds",
+        type=float,
+        default=600.0,
+        help="Audio held in memory at once with --low-memory (default: 600)",
+    )
+
+    parser.add_argument(
+        "--memory-budget",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Fail a video if process RSS exceeds this many MB (default: no limit)",
+    )
+
+    parser.add_argument(
+        "--decode-workers",
+        type=int,
+        default=None,
+        help="Local files to fingerprint in parallel (default: auto)",
+    )
+
+    parser.add_argument(
+        "--transcribe-threads",
+        type=int,
+        default=None,
+        help="Torch thread budget for transcription (default: tuning profile or torch default)",
+    )
+
+    parser.add_argument(
+        "--summarize-threads",
+        type=int,
+        default=None,
+        help="Torch thread budget for summarization (default: tuning profile or torch default)",
+    )
+
+    parser.add_argument(
+        "--interop-threads",
+        type=int,
+        default=None,
+        help="Torch inter-op thread pool size",
+    )
+
+    parser.add_argument(
+        "--transcribe-cpus",
+        type=str,
+        default=None,
+        help="CPU list to pin transcription to, e.g. 0-7",
+    )
+
+    parser.add_argument(
+        "--summarize-cpus",
+        type=str,
+        default=None,
+        help="CPU list to pin summarization to, e.g. 8-15",
+    )
+
+    parser.add_argument(
+        "--tuning-profile",
+        type=str,
+        default=None,
+        help=f"Tuning profile written by 'autotune' (default: {tuning.DEFAULT_PROFILE_PATH})",
+    )
+
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="Use synthetic download/transcription/summarization stages",
+    )
+    parser.add_argument(
+        "--fake-spec",
+        type=str,
+        default="",
+        metavar="SPEC",
+        help="Fake stage settings as key=value,... for --fake (see fakes.FakeOptions)",
+    )
+
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
 
     args, unknown = parser.parse_known_args()
 
+    if args.window_seconds <= 0:
+        parser.error("--window-seconds must be positive")
+    validate_download_args(parser, args)
+
+    transcribe_cpus = tuning.parse_cpu_list(args.transcribe_cpus)
+    summarize_cpus = tuning.parse_cpu_list(args.summarize_cpus)
+    try:
+        for cpus in (transcribe_cpus, summarize_cpus):
+            if cpus:
+                tuning.check_cpus_available(cpus)
+    except ValueError as e:
+        parser.error(str(e))
+
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    # Validate URL
-    if not args.url.startswith(("http://", "https://")):
-        logger.error("Invalid URL. Please provide a valid YouTube URL.")
-        sys.exit(1)
+    # Fall back to the auto-tuned thread counts for this machine
+    profile = tuning.load_profile(args.whisper_model, args.summarizer_model, args.tuning_profile) or {}
+    transcribe_threads = args.transcribe_threads or profile.get("transcribe_threads")
+    summarize_threads = args.summarize_threads or profile.get("summarize_threads")
+
+    # Split inputs into URLs and local paths
+    urls = [i for i in args.inputs if i.startswith(("http://", "https://"))]
+    local_paths = [i for i in args.inputs if not i.startswith(("http://", "https://"))]
+    for path in local_paths:
+        if not Path(path).exists():
+            logger.error(f"Invalid input: {path}. Provide a YouTube URL or an existing file/directory.")
+            sys.exit(1)
 
     try:
+        tuning.configure_interop_threads(args.interop_threads)
+
+        # Deduplicate local media by audio content before loading any models
+        local_files = []
+        unreadable = []
+        if local_paths:
+            local_files, unreadable = LocalMediaSource(workers=args.decode_workers).scan(local_paths)
+
         # Initialize summarizer
         summarizer = YouTubeSummarizer(
             whisper_model=args.whisper_model,
             summarizer_model=args.summarizer_model,
             output_dir=args.output_dir,
             cleanup=not args.no_cleanup,
+            transcribe_threads=transcribe_threads,
+            summarize_threads=summarize_threads,
+            transcribe_cpus=transcribe_cpus,
+            summarize_cpus=summarize_cpus,
+            download_concurrency=args.download_concurrency,
+            download_rate=args.download_rate,
+            download_retries=args.download_retries,
+            low_memory=args.low_memory,
+            memory_budget_mb=args.memory_budget,
+            window_seconds=args.window_seconds,
+            map_preset=args.map_preset,
+            reduce_preset=args.reduce_preset,
+            draft_model=args.draft_model,
+            fake=FakeOptions.from_spec(args.fake_spec) if args.fake else None,
         )
 
-        # Process video
-        result = summarizer.process_video(args.url)
-
-        # Output results
-        output_text = f"""
-{'=' * 60}
-YouTube Video Summary
-{'=' * 60}
-URL: {result['url']}
-
-{'=' * 60}
-TRANSCRIPT
-{'=' * 60}
-{result['transcript']}
-
-"""
-
-        if not args.transcript_only:
-            output_text += f"""
-{'=' * 60}
-SUMMARY
-{'=' * 60}
-{result['summary']}
-
-"""
-
-        if args.output:
-            # Write to file
-            output_path = Path(args.output)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(output_text, encoding="utf-8")
-            logger.info(f"Results saved to: {output_path}")
-        else:
-            # Print to stdout
-            print(output_text)
+        index = None if args.no_index else TranscriptIndex(args.index)
+
+        def handle_result(result: dict):
+            if index is not None:
+                try:
+                    index.add(result)
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to index {result['video_id']}: {str(e)}")
+            writer.write(result)
+
+        with ResultWriter(
+            output=args.output,
+            fmt=args.format,
+            compression=args.compress,
+            transcript_only=args.transcript_only,
+        ) as writer:
+            failed = asyncio.run(run_batch(summarizer, urls, local_files, handle_result))
+        failed += len(unreadable)
+
+        if index is not None:
+            index.close()
+
+        if failed:
+            logger.error(f"{failed} of {len(urls) + len(local_files) + len(unreadable)} inputs failed")
+            sys.exit(1)
 
     except KeyboardInterrupt:
         logger.info("\nInterrupted by user")
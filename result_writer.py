@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+"""
+Result Writer Module
+
+Writes processing results as they finish, as human-readable text, one
+JSON document per video, or a JSONL stream, with optional compression.
+"""
+
+import bz2
+import gzip
+import json
+import logging
+import lzma
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("text", "json", "jsonl")
+
+COMPRESSORS = {
+    "gzip": (gzip.open, ".gz"),
+    "bz2": (bz2.open, ".bz2"),
+    "xz": (lzma.open, ".xz"),
+}
+
+BUFFER_SIZE = 1 << 20
+
+
+def format_text(result: Dict, transcript_only: bool = False) -> str:
+    """
+    Format a processing result as human-readable text.
+
+    Args:
+        result: Dictionary returned by process_video/process_file
+        transcript_only: Omit the summary section
+
+    Returns:
+        Formatted text
+    """
+    output_text = f"""
+{'=' * 60}
+YouTube Video Summary
+{'=' * 60}
+URL: {result['url']}
+
+{'=' * 60}
+TRANSCRIPT
+{'=' * 60}
+{result['transcript']}
+
+"""
+
+    if not transcript_only:
+        output_text += f"""
+{'=' * 60}
+SUMMARY
+{'=' * 60}
+{result['summary']}
+
+"""
+
+    return output_text
+
+
+def compression_for_path(path: str) -> Optional[str]:
+    """Return the compression implied by a file suffix, if any."""
+    suffix = Path(path).suffix.lower()
+    for name, (_, ext) in COMPRESSORS.items():
+        if suffix == ext:
+            return name
+    return None
+
+
+class ResultWriter:
+    """Streams processing results to a file, directory or stdout."""
+
+    def __init__(
+        self,
+        output: Optional[str] = None,
+        fmt: str = "text",
+        compression: Optional[str] = None,
+        transcript_only: bool = False,
+        flush_interval: float = 5.0,
+    ):
+        """
+        Initialize the result writer.
+
+        Args:
+            output: Output path (a directory for 'json'), or None for stdout
+            fmt: 'text', 'json' or 'jsonl'
+            compression: 'gzip', 'bz2', 'xz' or None (inferred from the
+                output suffix when not given)
+            transcript_only: Leave summaries out of the output
+            flush_interval: Seconds between flushes of buffered output
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown output format '{fmt}', expected one of {FORMATS}")
+        if compression is not None and compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression '{compression}', expected one of {tuple(COMPRESSORS)}")
+
+        self.output = Path(output) if output else None
+        self.fmt = fmt
+        self.transcript_only = transcript_only
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._last_flush = time.monotonic()
+
+        if compression is None and output and fmt != "json":
+            compression = compression_for_path(output)
+        self.compression = compression
+        if self.compression and self.output is None:
+            raise ValueError("Compressed output requires an output path")
+
+        self._stream = None
+        if self.output is None:
+            self._stream = sys.stdout
+        elif fmt == "json":
+            self.output.mkdir(parents=True, exist_ok=True)
+        else:
+            self.output.parent.mkdir(parents=True, exist_ok=True)
+            self._stream = self._open(self.output)
+
+    def write(self, result: Dict):
+        """
+        Write one result.
+
+        Args:
+            result: Dictionary returned by process_video/process_file
+        """
+        record = self._record(result)
+
+        if self.fmt == "text":
+            self._stream.write(format_text(result, self.transcript_only))
+        elif self.fmt == "jsonl":
+            self._stream.write(json.dumps(record, ensure_ascii=False))
+            self._stream.write("\n")
+        elif self.output is None:
+            self._stream.write(json.dumps(record, ensure_ascii=False, indent=2))
+            self._stream.write("\n")
+        else:
+            ext = ".json" + (COMPRESSORS[self.compression][1] if self.compression else "")
+            with self._open(self.output / f"{record['video_id']}{ext}") as f:
+                json.dump(record, f, ensure_ascii=False, indent=2)
+
+        self.count += 1
+        if self._stream is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Flush buffered output."""
+        if self._stream is not None:
+            self._stream.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush and close the output."""
+        self.flush()
+        if self._stream is not None and self._stream is not sys.stdout:
+            self._stream.close()
+        self._stream = None
+        if self.output is not None:
+            logger.info(f"Wrote {self.count} results to: {self.output}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _open(self, path: Path) -> TextIO:
+        """Open a text file for writing, compressed if configured."""
+        if self.compression:
+            opener = COMPRESSORS[self.compression][0]
+            return opener(path, "wt", encoding="utf-8")
+        return open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE)
+
+    def _record(self, result: Dict) -> Dict:
+        """Build the structured record for a result."""
+        record = {
+            "video_id": result.get("video_id"),
+            "url": result.get("url"),
+            "transcript": result.get("transcript"),
+            "segments": result.get("segments", []),
+        }
+        if not self.transcript_only:
+            record["summary"] = result.get("summary")
+        return record
+
+
+# In[ ]:
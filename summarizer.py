@@ -12,22 +12,45 @@ Uses BART model for abstractive summarization, running entirely offline.
 """
 
 import logging
-from typing import Optional
+import math
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
 from transformers import pipeline
 import torch
 
+from generation_presets import DEFAULT_DRAFT_MODEL, GENERATION_PRESETS
+from low_memory import MemoryBudget, SpillFile
+from tuning import thread_budget
+
 logger = logging.getLogger(__name__)
 
 
 class Summarizer:
     """Summarizes text using offline transformer models."""
 
+    # Characters per chunk when splitting long text
+    chunk_size = 800
+
+    # Longer texts are chunked (map) before the final summary (reduce);
+    # shorter ones get a single reduce pass
+    max_direct_chars = 1024
+
+    # Low-memory mode keeps condensing chunk summaries on disk until they
+    # fit in this many characters, then loads them for the final reduce
+    max_reduce_chars = 4096
+
     def __init__(
         self,
         model_name: str = "facebook/bart-large-cnn",
         max_length: int = 142,
         min_length: int = 56,
         device: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        cpu_affinity: Optional[List[int]] = None,
+        map_preset: str = "full",
+        reduce_preset: str = "full",
+        draft_model_name: str = DEFAULT_DRAFT_MODEL,
+        strict: bool = False,
     ):
         """
         Initialize the summarizer.
@@ -37,12 +60,33 @@ class Summarizer:
             max_length: Maximum length of the summary
             min_length: Minimum length of the summary
             device: Device to run on ('cpu', 'cuda', or None for auto-detection)
+            num_threads: Torch intra-op threads while summarizing (None keeps the default)
+            cpu_affinity: Optional CPU ids to pin summarization to
+            map_preset: Generation preset for per-chunk summaries (see GENERATION_PRESETS)
+            reduce_preset: Generation preset for the final summary
+            draft_model_name: Small model drafting tokens for the 'assisted' preset;
+                must share the main model's tokenizer
+            strict: Raise when a chunk fails to summarize instead of falling
+                back to the chunk's first 200 characters
         """
+        for preset in (map_preset, reduce_preset):
+            if preset not in GENERATION_PRESETS:
+                raise ValueError(
+                    f"Unknown generation preset '{preset}', expected one of {tuple(GENERATION_PRESETS)}"
+                )
+
         self.model_name = model_name
         self.max_length = max_length
         self.min_length = min_length
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.num_threads = num_threads
+        self.cpu_affinity = cpu_affinity
+        self.map_preset = map_preset
+        self.reduce_preset = reduce_preset
+        self.draft_model_name = draft_model_name
+        self.strict = strict
         self.summarizer_pipeline = None
+        self.draft_model = None
 
         logger.info(f"Initializing summarizer: {model_name} on {self.device}")
 
@@ -67,6 +111,50 @@ class Summarizer:
             logger.error(f"Error loading summarization model: {str(e)}")
             raise Exception(f"Failed to load summarization model: {str(e)}")
 
+    def load_draft_model(self):
+        """Load the draft model used by the 'assisted' preset."""
+        if self.draft_model is not None:
+            return
+
+        try:
+            from transformers import AutoModelForSeq2SeqLM
+
+            logger.info(f"Loading draft model '{self.draft_model_name}'...")
+            self.draft_model = AutoModelForSeq2SeqLM.from_pretrained(self.draft_model_name).to(self.device)
+            logger.info("Draft model loaded successfully")
+
+        except Exception as e:
+            logger.error(f"Error loading draft model: {str(e)}")
+            raise Exception(f"Failed to load draft model: {str(e)}")
+
+    def _generate(self, text: str, max_length: int, min_length: int, stage: str = "reduce") -> str:
+        """
+        Run the pipeline on one piece of text with the preset for a stage.
+
+        Args:
+            text: Text to summarize
+            max_length: Maximum length of the summary
+            min_length: Minimum length of the summary
+            stage: 'map' for per-chunk summaries, 'reduce' for the final summary
+
+        Returns:
+            Summary text
+        """
+        preset = self.map_preset if stage == "map" else self.reduce_preset
+        generate_kwargs = dict(GENERATION_PRESETS[preset])
+        if preset == "assisted":
+            self.load_draft_model()
+            generate_kwargs["assistant_model"] = self.draft_model
+
+        result = self.summarizer_pipeline(
+            text,
+            max_length=max_length,
+            min_length=min_length,
+            do_sample=False,
+            **generate_kwargs,
+        )
+        return result[0]["summary_text"]
+
     def summarize(self, text: str, max_length: Optional[int] = None, min_length: Optional[int] = None) -> str:
         """
         Summarize the given text.
@@ -91,17 +179,12 @@ class Summarizer:
         try:
             logger.info(f"Summarizing text (length: {len(text)} characters)")
 
-            # Handle long texts by chunking
-            if len(text) > 1024:
-                summary = self._summarize_long_text(text, max_len, min_len)
-            else:
-                result = self.summarizer_pipeline(
-                    text,
-                    max_length=max_len,
-                    min_length=min_len,
-                    do_sample=False,
-                )
-                summary = result[0]["summary_text"]
+            with thread_budget(self.num_threads, self.cpu_affinity):
+                # Handle long texts by chunking
+                if len(text) > self.max_direct_chars:
+                    summary = self._summarize_long_text(text, max_len, min_len)
+                else:
+                    summary = self._generate(text, max_len, min_len, stage="reduce")
 
             logger.info(f"Summary generated (length: {len(summary)} characters)")
 
@@ -125,7 +208,7 @@ class Summarizer:
         """
         # Split text into chunks (sentences)
         sentences = text.split(". ")
-        chunk_size = 800  # Characters per chunk
+        chunk_size = self.chunk_size
         chunks = []
         current_chunk = ""
 
@@ -147,14 +230,17 @@ class Summarizer:
         for i, chunk in enumerate(chunks):
             logger.info(f"Summarizing chunk {i+1}/{len(chunks)}")
             try:
-                result = self.summarizer_pipeline(
-                    chunk,
-                    max_length=max_length // max(1, len(chunks)) + 50,
-                    min_length=min_length // max(1, len(chunks)) + 10,
-                    do_sample=False,
+                chunk_summaries.append(
+                    self._generate(
+                        chunk,
+                        max_length // max(1, len(chunks)) + 50,
+                        min_length // max(1, len(chunks)) + 10,
+                        stage="map",
+                    )
                 )
-                chunk_summaries.append(result[0]["summary_text"])
             except Exception as e:
+                if self.strict:
+                    raise
                 logger.warning(f"Error summarizing chunk {i+1}: {str(e)}")
                 # Fallback: use first part of chunk
                 chunk_summaries.append(chunk[:200] + "...")
@@ -163,21 +249,129 @@ class Summarizer:
         combined_summary = " ".join(chunk_summaries)
 
         # If combined summary is still too long, summarize it again
-        if len(combined_summary) > 1024:
+        if len(combined_summary) > self.max_direct_chars:
             logger.info("Combined summary too long, summarizing again...")
-            result = self.summarizer_pipeline(
-                combined_summary,
-                max_length=max_length,
-                min_length=min_length,
-                do_sample=False,
-            )
-            return result[0]["summary_text"]
+            return self._generate(combined_summary, max_length, min_length, stage="reduce")
 
         return combined_summary
 
+    def summarize_spilled(
+        self,
+        segments: SpillFile,
+        spill_dir: Path,
+        budget: Optional[MemoryBudget] = None,
+        max_length: Optional[int] = None,
+        min_length: Optional[int] = None,
+    ) -> str:
+        """
+        Summarize a transcript streamed from a spill file with bounded memory.
 
-# In[ ]:
+        Chunk summaries are spilled to disk rather than kept in memory. All
+        chunk-level passes use the map preset, repeated level by level until
+        the combined summaries fit in max_reduce_chars; those are then loaded
+        and, as in summarize(), reduced once with the reduce preset if longer
+        than max_direct_chars.
 
+        Args:
+            segments: Spill file of transcript segments with 'text'
+            spill_dir: Directory for intermediate chunk-summary files
+            budget: Optional memory budget checked before each chunk
+            max_length: Maximum length of summary (overrides initialization)
+            min_length: Minimum length of summary (overrides initialization)
+
+        Returns:
+            Summarized text
+        """
+        if self.summarizer_pipeline is None:
+            self.load_model()
 
+        if segments.chars == 0:
+            raise ValueError("Input text is empty")
 
+        max_len = max_length or self.max_length
+        min_len = min_length or self.min_length
+
+        try:
+            logger.info(f"Summarizing spilled transcript (length: {segments.chars} characters)")
+
+            with thread_budget(self.num_threads, self.cpu_affinity):
+                if segments.chars <= self.max_direct_chars:
+                    text = " ".join(seg["text"] for seg in segments)
+                    return self._generate(text, max_len, min_len, stage="reduce").strip()
+
+                level = 0
+                pieces = (seg["text"] for seg in segments)
+                total_chars = segments.chars
+
+                while True:
+                    num_chunks = max(1, math.ceil(total_chars / self.chunk_size))
+                    summaries = SpillFile(Path(spill_dir) / f"summaries-{level}.jsonl")
+                    logger.info(f"Summarizing ~{num_chunks} chunks (level {level})")
+
+                    for i, chunk in enumerate(self._iter_chunks(pieces)):
+                        if budget is not None:
+                            budget.check("summarization")
+                        try:
+                            summary = self._generate(
+                                chunk,
+                                max_len // num_chunks + 50,
+                                min_len // num_chunks + 10,
+                                stage="map",
+                            )
+                            summaries.append({"text": summary})
+                        except MemoryError:
+                            raise
+                        except Exception as e:
+                            if self.strict:
+                                raise
+                            logger.warning(f"Error summarizing chunk {i+1} (level {level}): {str(e)}")
+                            summaries.append({"text": chunk[:200] + "..."})
+                    summaries.close()
+
+                    if summaries.chars <= self.max_reduce_chars or summaries.chars >= total_chars:
+                        combined_summary = " ".join(rec["text"] for rec in summaries)
+                        break
+
+                    logger.info("Chunk summaries too long to load, condensing again...")
+                    pieces = (rec["text"] for rec in summaries)
+                    total_chars = summaries.chars
+                    level += 1
+
+                if len(combined_summary) > self.max_direct_chars:
+                    logger.info("Combined summary too long, summarizing again...")
+                    summary = self._generate(combined_summary, max_len, min_len, stage="reduce")
+                else:
+                    summary = combined_summary
+
+            logger.info(f"Summary generated (length: {len(summary)} characters)")
+            return summary.strip()
 
+        except MemoryError:
+            # Includes MemoryBudgetExceeded, which callers handle separately
+            raise
+        except Exception as e:
+            logger.error(f"Error during summarization: {str(e)}")
+            raise Exception(f"Summarization failed: {str(e)}")
+
+    def _iter_chunks(self, pieces: Iterable[str]) -> Iterator[str]:
+        """
+        Group a stream of text pieces into chunks of about chunk_size characters.
+
+        Args:
+            pieces: Text pieces (segments or earlier summaries)
+
+        Yields:
+            Chunks of joined pieces
+        """
+        current_chunk = ""
+        for piece in pieces:
+            if current_chunk and len(current_chunk) + len(piece) >= self.chunk_size:
+                yield current_chunk.strip()
+                current_chunk = ""
+            current_chunk += piece + " "
+
+        if current_chunk.strip():
+            yield current_chunk.strip()
+
+
+# In[ ]:
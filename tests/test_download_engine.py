@@ -0,0 +1,210 @@
+"""Tests for download error classification and the async download engine."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("yt_dlp")
+
+from downloader import (  # noqa: E402
+    PermanentDownloadError,
+    TransientDownloadError,
+    YouTubeDownloader,
+    classify_download_error,
+)
+from download_engine import AsyncDownloadEngine, TokenBucket  # noqa: E402
+
+
+class StubDownloader(YouTubeDownloader):
+    """Downloader that fails a scripted number of times per video."""
+
+    def __init__(self, output_dir, failures=None, delay=0.0):
+        super().__init__(output_dir=str(output_dir))
+        self.failures = dict(failures or {})
+        self.delay = delay
+        self.calls = {}
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def download_audio(self, url, video_id=None):
+        video_id = video_id or self.extract_video_id(url)
+        with self._lock:
+            self.calls[video_id] = self.calls.get(video_id, 0) + 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            remaining = self.failures.get(video_id, [])
+            if remaining:
+                raise remaining.pop(0)
+            return str(self.output_dir / f"{video_id}.wav")
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        Exception("ERROR: unable to download webpage: HTTP Error 429: Too Many Requests"),
+        Exception("HTTP Error 503: Service Unavailable"),
+        Exception("The read operation timed out"),
+        Exception("[Errno 104] Connection reset by peer"),
+        ConnectionError("boom"),
+        TimeoutError(),
+    ],
+)
+def test_classify_transient(error):
+    assert classify_download_error(error) is TransientDownloadError
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        Exception("ERROR: [youtube] abc: Video unavailable"),
+        Exception("ERROR: [youtube] abc: Private video"),
+        Exception("HTTP Error 404: Not Found"),
+        Exception("Unsupported URL: https://example.com"),
+        FileNotFoundError("Downloaded audio file not found for abc"),
+    ],
+)
+def test_classify_permanent(error):
+    assert classify_download_error(error) is PermanentDownloadError
+
+
+def test_token_bucket_limits_rate():
+    async def take(n):
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # The first token is free, the remaining four arrive at 20/s
+    elapsed = asyncio.run(take(5))
+    assert 0.18 <= elapsed < 1.0
+
+
+def test_token_bucket_allows_burst():
+    async def take(n):
+        bucket = TokenBucket(rate=1, capacity=5)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(take(5)) < 0.1
+
+
+def test_token_bucket_rejects_bad_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_retries_transient_errors(tmp_path):
+    downloader = StubDownloader(
+        tmp_path, failures={"abc": [TransientDownloadError("429"), TransientDownloadError("503")]}
+    )
+    engine = AsyncDownloadEngine(downloader, max_retries=3, backoff_base=0.01)
+
+    path = asyncio.run(engine.download("https://youtu.be/abc"))
+
+    assert path.endswith("abc.wav")
+    assert downloader.calls["abc"] == 3
+
+
+def test_gives_up_after_max_retries(tmp_path):
+    downloader = StubDownloader(tmp_path, failures={"abc": [TransientDownloadError("429")] * 10})
+    engine = AsyncDownloadEngine(downloader, max_retries=2, backoff_base=0.01)
+
+    with pytest.raises(TransientDownloadError):
+        asyncio.run(engine.download("https://youtu.be/abc"))
+    assert downloader.calls["abc"] == 3
+
+
+def test_does_not_retry_permanent_errors(tmp_path):
+    downloader = StubDownloader(tmp_path, failures={"abc": [PermanentDownloadError("unavailable")]})
+    engine = AsyncDownloadEngine(downloader, max_retries=3, backoff_base=0.01)
+
+    with pytest.raises(PermanentDownloadError):
+        asyncio.run(engine.download("https://youtu.be/abc"))
+    assert downloader.calls["abc"] == 1
+
+
+def test_backoff_grows_exponentially(tmp_path, monkeypatch):
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def record_sleep(delay):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr("download_engine.random.uniform", lambda a, b: 1.0)
+    monkeypatch.setattr("download_engine.asyncio.sleep", record_sleep)
+    downloader = StubDownloader(tmp_path, failures={"abc": [TransientDownloadError("429")] * 4})
+    engine = AsyncDownloadEngine(downloader, max_retries=4, backoff_base=1.0, backoff_max=5.0)
+
+    asyncio.run(engine.download("https://youtu.be/abc"))
+
+    assert delays == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_iter_downloads_caps_concurrency_and_reports_errors(tmp_path):
+    downloader = StubDownloader(
+        tmp_path, failures={"bad": [PermanentDownloadError("unavailable")]}, delay=0.05
+    )
+    engine = AsyncDownloadEngine(downloader, max_concurrency=2, backoff_base=0.01)
+    urls = [f"https://youtu.be/v{i}" for i in range(6)] + ["https://youtu.be/bad"]
+
+    results = asyncio.run(engine.download_many(urls))
+
+    assert downloader.max_active <= 2
+    assert {url for url, path, error in results if path} == set(urls[:6])
+    assert [url for url, path, error in results if error] == ["https://youtu.be/bad"]
+
+
+def test_iter_downloads_deduplicates_by_video_id(tmp_path):
+    downloader = StubDownloader(tmp_path)
+    engine = AsyncDownloadEngine(downloader)
+    urls = [
+        "https://www.youtube.com/watch?v=abc",
+        "https://youtu.be/abc",
+        "https://www.youtube.com/watch?v=abc",
+        "https://youtu.be/def",
+    ]
+
+    results = asyncio.run(engine.download_many(urls))
+
+    assert sorted(url for url, _, _ in results) == [
+        "https://www.youtube.com/watch?v=abc",
+        "https://youtu.be/def",
+    ]
+    assert downloader.calls == {"abc": 1, "def": 1}
+
+
+def test_iter_downloads_yields_while_waiting_for_arrivals(tmp_path):
+    engine = AsyncDownloadEngine(StubDownloader(tmp_path))
+
+    async def arrivals():
+        yield "https://youtu.be/first"
+        await asyncio.sleep(0.3)
+        yield "https://youtu.be/second"
+
+    async def collect():
+        start = time.monotonic()
+        return [(url, time.monotonic() - start) async for url, _, _ in engine.iter_downloads(arrivals())]
+
+    results = asyncio.run(collect())
+
+    assert [url for url, _ in results] == ["https://youtu.be/first", "https://youtu.be/second"]
+    assert results[0][1] < 0.2
+    assert results[1][1] >= 0.3
+
+
+@pytest.mark.parametrize("kwargs", [{"max_concurrency": 0}, {"max_concurrency": -1}, {"max_retries": -1}])
+def test_engine_rejects_invalid_limits(tmp_path, kwargs):
+    with pytest.raises(ValueError):
+        AsyncDownloadEngine(StubDownloader(tmp_path), **kwargs)
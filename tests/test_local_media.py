@@ -0,0 +1,55 @@
+"""Tests for acoustic fingerprint matching and video IDs."""
+
+from pathlib import Path
+
+import numpy as np
+
+from local_media import FINGERPRINT_SAMPLE_RATE, AudioFingerprint, LocalMediaSource
+
+
+def tone_mix(seconds, seed):
+    """Random sum of tones with a slowly varying envelope."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * FINGERPRINT_SAMPLE_RATE)) / FINGERPRINT_SAMPLE_RATE
+    signal = np.zeros_like(t)
+    for freq in rng.uniform(300, 3000, 12):
+        envelope = 1 + np.sin(2 * np.pi * rng.uniform(0.1, 2) * t + rng.uniform(0, np.pi))
+        signal += envelope * np.sin(2 * np.pi * freq * t)
+    return (signal / np.abs(signal).max()).astype(np.float32)
+
+
+def fingerprint(samples, duration=None):
+    bits = LocalMediaSource()._fingerprint_bits(samples)
+    return AudioFingerprint(duration or len(samples) / FINGERPRINT_SAMPLE_RATE, bits)
+
+
+def test_noisy_copy_matches():
+    samples = tone_mix(30, seed=1)
+    noisy = samples + np.random.default_rng(2).normal(0, 0.01, len(samples)).astype(np.float32)
+    assert fingerprint(samples).matches(fingerprint(noisy))
+
+
+def test_different_recordings_do_not_match():
+    assert not fingerprint(tone_mix(30, seed=1)).matches(fingerprint(tone_mix(30, seed=3)))
+
+
+def test_duration_mismatch_does_not_match():
+    samples = tone_mix(30, seed=1)
+    assert not fingerprint(samples, 300).matches(fingerprint(samples, 1800))
+
+
+def test_silent_or_short_fingerprints_never_match():
+    silent = fingerprint(np.zeros(30 * FINGERPRINT_SAMPLE_RATE, dtype=np.float32))
+    short = fingerprint(np.zeros(100, dtype=np.float32), duration=0.01)
+    assert not silent.usable and not short.usable
+    assert not silent.matches(silent)
+    assert not short.matches(short)
+
+
+def test_video_id_is_unique_per_file():
+    silent = np.zeros(30 * FINGERPRINT_SAMPLE_RATE, dtype=np.float32)
+    a = fingerprint(silent, 300)
+    b = fingerprint(silent, 1800)
+    assert a.video_id(Path("a.wav")) != b.video_id(Path("b.wav"))
+    assert a.video_id(Path("a.wav")) != a.video_id(Path("copy/a.wav"))
+    assert a.video_id(Path("a.wav")) == fingerprint(silent, 300).video_id(Path("a.wav"))
@@ -0,0 +1,29 @@
+"""Tests for windowed reads of decoded audio."""
+
+import numpy as np
+import pytest
+
+from low_memory import SAMPLE_RATE, iter_audio_windows
+
+
+def write_pcm(path, seconds):
+    samples = np.sin(np.arange(int(seconds * SAMPLE_RATE)) / 7).astype(np.float32)
+    samples.tofile(path)
+    return samples
+
+
+def test_windows_cover_the_file_in_order(tmp_path):
+    pcm_path = tmp_path / "audio.f32"
+    samples = write_pcm(pcm_path, 5)
+
+    windows = list(iter_audio_windows(pcm_path, window_seconds=2, search_seconds=0.5))
+    assert [offset for offset, _ in windows] == sorted(offset for offset, _ in windows)
+    np.testing.assert_array_equal(np.concatenate([w for _, w in windows]), samples)
+
+
+@pytest.mark.parametrize("window_seconds", [0, -1])
+def test_rejects_non_positive_window(tmp_path, window_seconds):
+    pcm_path = tmp_path / "audio.f32"
+    write_pcm(pcm_path, 1)
+    with pytest.raises(ValueError):
+        next(iter_audio_windows(pcm_path, window_seconds=window_seconds))
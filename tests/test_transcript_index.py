@@ -0,0 +1,82 @@
+"""Tests for the SQLite transcript index."""
+
+import sqlite3
+
+import pytest
+
+from transcript_index import TranscriptIndex
+
+
+def make_result(video_id, *texts, url=None):
+    return {
+        "video_id": video_id,
+        "url": url or f"https://youtu.be/{video_id}",
+        "summary": f"summary of {video_id}",
+        "segments": [
+            {"start": 10.0 * i, "end": 10.0 * (i + 1), "text": text} for i, text in enumerate(texts)
+        ],
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TranscriptIndex(str(tmp_path / "index.db"))
+    yield index
+    index.close()
+
+
+def test_add_and_search(index):
+    index.add(make_result("a", "gradient descent converges", "unrelated words here"))
+    index.add(make_result("b", "stochastic gradient descent"))
+
+    hits = index.search("gradient")
+    assert {hit["video_id"] for hit in hits} == {"a", "b"}
+    hit = next(hit for hit in hits if hit["video_id"] == "a")
+    assert hit["url"] == "https://youtu.be/a"
+    assert (hit["start"], hit["end"]) == (0.0, 10.0)
+    assert "[gradient]" in hit["snippet"]
+
+
+def test_replace_drops_old_segments(index):
+    index.add(make_result("a", "first version about cats"))
+    index.add(make_result("b", "cats and dogs"))
+    index.add(make_result("a", "second version about dogs"))
+
+    assert [hit["video_id"] for hit in index.search("cats")] == ["b"]
+    assert {hit["video_id"] for hit in index.search("dogs")} == {"a", "b"}
+    assert index.search("first") == []
+
+
+def test_search_orders_by_rank(index):
+    index.add(make_result("weak", "attention is mentioned once among many other filler words here"))
+    index.add(make_result("strong", "attention attention attention"))
+
+    assert [hit["video_id"] for hit in index.search("attention")] == ["strong", "weak"]
+
+
+def test_search_without_video_row(index):
+    index.add(make_result("a", "orphan segment"))
+    index.conn.execute("DELETE FROM videos")
+
+    hits = index.search("orphan")
+    assert [(hit["video_id"], hit["url"]) for hit in hits] == [("a", None)]
+
+
+def test_invalid_query(index):
+    with pytest.raises(ValueError):
+        index.search('"unterminated')
+
+
+def test_migrates_legacy_layout(tmp_path):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE VIRTUAL TABLE segments USING fts5(text, video_id UNINDEXED, start UNINDEXED, end UNINDEXED)")
+    conn.execute("INSERT INTO segments VALUES ('legacy words', 'old', 1.0, 2.0)")
+    conn.commit()
+    conn.close()
+
+    index = TranscriptIndex(str(path))
+    try:
+        assert [(hit["video_id"], hit["start"]) for hit in index.search("legacy")] == [("old", 1.0)]
+    finally:
+        index.close()
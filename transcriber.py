@@ -11,25 +11,38 @@ Uses OpenAI Whisper (openai-whisper package) to transcribe audio locally.
 """
 
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 import torch
 
+from low_memory import MemoryBudget, SpillFile, decode_to_file, iter_audio_windows
+from tuning import thread_budget
+
 logger = logging.getLogger(__name__)
 
 
 class Transcriber:
     """Transcribes audio files using Whisper."""
 
-    def __init__(self, model_size: str = "base", device: Optional[str] = None):
+    def __init__(
+        self,
+        model_size: str = "base",
+        device: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        cpu_affinity: Optional[List[int]] = None,
+    ):
         """
         Initialize the transcriber.
 
         Args:
             model_size: Whisper model size ('tiny','base','small','medium','large')
             device: 'cpu' or 'cuda' or None for auto-detect
+            num_threads: Torch intra-op threads while transcribing (None keeps the default)
+            cpu_affinity: Optional CPU ids to pin transcription to
         """
         self.model_size = model_size
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.num_threads = num_threads
+        self.cpu_affinity = cpu_affinity
         self.model = None
         logger.info(f"Initializing Transcriber: model={model_size} device={self.device}")
 
@@ -60,27 +73,108 @@ class Transcriber:
         Returns:
             Transcript string
         """
+        return self.transcribe_segments(audio_path, language=language, task=task)["text"]
+
+    def transcribe_segments(
+        self, audio_path: str, language: Optional[str] = None, task: str = "transcribe"
+    ) -> Dict:
+        """
+        Transcribe an audio file, keeping segment timestamps.
+
+        Args:
+            audio_path: Path to audio file
+            language: Optional ISO language code (e.g. 'en') to force language
+            task: 'transcribe' or 'translate'
+
+        Returns:
+            Dictionary with 'text' (full transcript) and 'segments'
+            (list of dicts with 'start', 'end' in seconds and 'text')
+        """
         if self.model is None:
             self.load_model()
 
         try:
             logger.info(f"Transcribing audio: {audio_path}")
-            # whisper's transcribe returns a dict with 'text'
+            # whisper's transcribe returns a dict with 'text' and 'segments'
             options = {"task": task}
             if language:
                 options["language"] = language
 
-            result = self.model.transcribe(audio_path, **options)
+            with thread_budget(self.num_threads, self.cpu_affinity):
+                result = self.model.transcribe(audio_path, **options)
             transcript = result.get("text", "").strip()
-            logger.info(f"Transcription length: {len(transcript)} characters")
-            return transcript
+            segments = [
+                {"start": seg["start"], "end": seg["end"], "text": seg["text"].strip()}
+                for seg in result.get("segments", [])
+            ]
+            logger.info(f"Transcription length: {len(transcript)} characters, {len(segments)} segments")
+            return {"text": transcript, "segments": segments}
         except Exception as e:
             logger.error(f"Error transcribing audio: {str(e)}")
             raise
 
+    def transcribe_windowed(
+        self,
+        audio_path: str,
+        segments: SpillFile,
+        window_seconds: float = 600.0,
+        budget: Optional[MemoryBudget] = None,
+        language: Optional[str] = None,
+        task: str = "transcribe",
+    ):
+        """
+        Transcribe an audio file window by window with bounded memory.
 
-# In[ ]:
+        The audio is decoded once to a raw float32 file next to the spill
+        file and read back one window at a time, and segments are appended
+        to the spill file as each window finishes. The tail of each window's
+        text is passed as the prompt for the next one to keep context across
+        boundaries.
+
+        Args:
+            audio_path: Path to audio file
+            segments: Spill file receiving dicts with 'start', 'end' and 'text'
+            window_seconds: Length of audio held in memory at once
+            budget: Optional memory budget checked before each window
+            language: Optional ISO language code (e.g. 'en') to force language
+            task: 'transcribe' or 'translate'
+        """
+        if self.model is None:
+            self.load_model()
+
+        pcm_path = segments.path.with_suffix(".f32")
 
+        try:
+            logger.info(f"Transcribing audio in {window_seconds:.0f}s windows: {audio_path}")
+            options = {"task": task}
+            if language:
+                options["language"] = language
 
+            decode_to_file(audio_path, pcm_path)
+            prompt = None
 
+            for offset, window in iter_audio_windows(pcm_path, window_seconds):
+                if budget is not None:
+                    budget.check("transcription")
 
+                with thread_budget(self.num_threads, self.cpu_affinity):
+                    result = self.model.transcribe(window, initial_prompt=prompt, **options)
+
+                for seg in result.get("segments", []):
+                    segments.append({
+                        "start": seg["start"] + offset,
+                        "end": seg["end"] + offset,
+                        "text": seg["text"].strip(),
+                    })
+                prompt = result.get("text", "").strip()[-200:] or None
+
+            segments.close()
+            logger.info(f"Transcription length: {segments.chars} characters, {segments.count} segments")
+        except Exception as e:
+            logger.error(f"Error transcribing audio: {str(e)}")
+            raise
+        finally:
+            pcm_path.unlink(missing_ok=True)
+
+
+# In[ ]:
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+"""
+Transcript Index Module
+
+Stores processed transcripts with segment timestamps in a local SQLite
+database, with an FTS5 full-text index over the segment text, and
+searches them.
+"""
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = Path.home() / ".cache" / "youtube-summarizer" / "transcripts.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    url TEXT,
+    summary TEXT,
+    indexed_at REAL
+);
+CREATE TABLE IF NOT EXISTS segment_rows (
+    id INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    start REAL,
+    end REAL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segment_rows_video_id ON segment_rows (video_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+    text,
+    content='segment_rows',
+    content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS segment_rows_insert AFTER INSERT ON segment_rows BEGIN
+    INSERT INTO segments (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segment_rows_delete AFTER DELETE ON segment_rows BEGIN
+    INSERT INTO segments (segments, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+class TranscriptIndex:
+    """Full-text index over processed transcripts."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (or create) the transcript index.
+
+        Args:
+            db_path: SQLite database path (default: ~/.cache/youtube-summarizer/transcripts.db)
+        """
+        self.db_path = Path(db_path) if db_path else DEFAULT_INDEX_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            self.conn = sqlite3.connect(str(self.db_path))
+            legacy_rows = self._drop_legacy_segments()
+            self.conn.executescript(SCHEMA)
+            if legacy_rows:
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT INTO segment_rows (video_id, start, end, text) VALUES (?, ?, ?, ?)",
+                        legacy_rows,
+                    )
+        except sqlite3.OperationalError as e:
+            raise RuntimeError(f"Failed to open transcript index {self.db_path}: {str(e)}")
+
+    def _drop_legacy_segments(self) -> List[tuple]:
+        """
+        Drop a segments table from the older self-contained FTS5 layout.
+
+        That layout kept video_id inside the FTS5 table, where it cannot be
+        indexed. Its rows are returned so they can be re-inserted.
+        """
+        row = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'segments'"
+        ).fetchone()
+        if row is None or "content=" in row[0]:
+            return []
+
+        rows = self.conn.execute("SELECT video_id, start, end, text FROM segments").fetchall()
+        with self.conn:
+            self.conn.execute("DROP TABLE segments")
+        logger.info(f"Migrating {len(rows)} segments to the current index layout")
+        return rows
+
+    def add(self, result: Dict):
+        """
+        Insert or replace one processed video.
+
+        Args:
+            result: Processing result with 'video_id', 'url', 'summary' and
+                'segments' (falls back to the full 'transcript' as a single
+                segment when no timestamps are available)
+        """
+        video_id = result["video_id"]
+        segments = result.get("segments") or [
+            {"start": 0.0, "end": 0.0, "text": result.get("transcript", "")}
+        ]
+
+        with self.conn:
+            # segment_rows is indexed on video_id; the delete trigger keeps
+            # the full-text index in sync
+            self.conn.execute("DELETE FROM segment_rows WHERE video_id = ?", (video_id,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO videos (video_id, url, summary, indexed_at) VALUES (?, ?, ?, ?)",
+                (video_id, result.get("url"), result.get("summary"), time.time()),
+            )
+            self.conn.executemany(
+                "INSERT INTO segment_rows (text, video_id, start, end) VALUES (?, ?, ?, ?)",
+                [(seg["text"], video_id, seg["start"], seg["end"]) for seg in segments if seg["text"]],
+            )
+
+        logger.info(f"Indexed {len(segments)} segments for {video_id}")
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Search indexed transcripts.
+
+        Args:
+            query: FTS5 query (plain words, "phrases", AND/OR/NOT, prefix*)
+            limit: Maximum number of hits
+
+        Returns:
+            List of dicts with 'video_id', 'url', 'start', 'end' and 'snippet',
+            best matches first
+        """
+        try:
+            rows = self.conn.execute(
+                """
+                SELECT r.video_id, v.url, r.start, r.end,
+                       snippet(segments, 0, '[', ']', '...', 16)
+                FROM segments
+                JOIN segment_rows r ON r.id = segments.rowid
+                LEFT JOIN videos v ON v.video_id = r.video_id
+                WHERE segments MATCH ?
+                ORDER BY segments.rank
+                LIMIT ?
+                """,
+                (query, limit),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query '{query}': {str(e)}")
+
+        return [
+            {"video_id": video_id, "url": url, "start": start, "end": end, "snippet": snippet}
+            for video_id, url, start, end, snippet in rows
+        ]
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as H:MM:SS."""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+# In[ ]:
@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[1]:
+
+
+"""
+CPU Tuning Module
+
+Controls torch thread budgets and CPU affinity for the inference stages,
+and auto-tunes them against a local audio sample.
+"""
+
+import json
+import logging
+import os
+import socket
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_PATH = Path.home() / ".cache" / "youtube-summarizer" / "tuning.json"
+
+
+def parse_cpu_list(spec: Optional[str]) -> Optional[List[int]]:
+    """
+    Parse a CPU list such as '0-3,8,10-11'.
+
+    Args:
+        spec: Comma-separated CPU ids and ranges, or None
+
+    Returns:
+        Sorted list of CPU ids, or None if spec is empty
+    """
+    if not spec:
+        return None
+
+    cpus = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cpus.update(range(int(start), int(end) + 1))
+        else:
+            cpus.add(int(part))
+
+    if not cpus:
+        return None
+    return sorted(cpus)
+
+
+def configure_interop_threads(num_threads: Optional[int]):
+    """
+    Set the torch inter-op thread pool size.
+
+    Torch only allows this once, before any inter-op work has started,
+    so it should be called at startup.
+
+    Args:
+        num_threads: Inter-op thread count, or None to keep the default
+    """
+    if not num_threads:
+        return
+
+    import torch
+
+    try:
+        torch.set_num_interop_threads(num_threads)
+        logger.info(f"Inter-op threads set to {num_threads}")
+    except RuntimeError as e:
+        logger.warning(f"Could not set inter-op threads: {str(e)}")
+
+
+def _thread_ids() -> List[int]:
+    """Return the kernel thread ids of this process (just 0, the caller, if unknown)."""
+    try:
+        return [int(tid) for tid in os.listdir("/proc/self/task")]
+    except OSError:
+        return [0]
+
+
+def check_cpus_available(cpus: Iterable[int]):
+    """
+    Verify that CPUs can be pinned to.
+
+    Args:
+        cpus: CPU ids to check
+
+    Raises:
+        ValueError: If any CPU is outside this process's allowed set
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return
+
+    allowed = os.sched_getaffinity(0)
+    unavailable = sorted(set(cpus) - allowed)
+    if unavailable:
+        raise ValueError(
+            f"CPUs {unavailable} are not available to this process "
+            f"(allowed: {','.join(str(cpu) for cpu in sorted(allowed))})"
+        )
+
+
+def _set_process_affinity(cpus: Set[int]) -> Dict[int, Set[int]]:
+    """
+    Pin every thread of the process to a CPU set.
+
+    On Linux, sched_setaffinity only affects one thread, and torch's worker
+    threads keep the mask they were created with, so each one is pinned
+    explicitly. That includes threads unrelated to the stage, such as the
+    asyncio loop and download executor threads, and child processes they
+    start while pinned (e.g. FFmpeg) inherit the mask.
+
+    Args:
+        cpus: CPU ids to pin to
+
+    Returns:
+        Previous mask per thread id, for _restore_process_affinity
+
+    Raises:
+        OSError: If the calling thread cannot be pinned to the CPU set
+    """
+    caller = threading.get_native_id()
+    previous = {caller: os.sched_getaffinity(0)}
+    os.sched_setaffinity(0, cpus)
+
+    for tid in _thread_ids():
+        if tid in (0, caller):
+            continue
+        try:
+            previous[tid] = os.sched_getaffinity(tid)
+            os.sched_setaffinity(tid, cpus)
+        except ProcessLookupError:
+            # Thread exited between listing and pinning
+            continue
+    return previous
+
+
+def _restore_process_affinity(previous: Dict[int, Set[int]]):
+    """
+    Undo _set_process_affinity.
+
+    Threads started while pinned get the calling thread's previous mask.
+
+    Args:
+        previous: Mask per thread id returned by _set_process_affinity
+    """
+    caller = threading.get_native_id()
+    default = previous[caller]
+    os.sched_setaffinity(0, default)
+
+    for tid in _thread_ids():
+        if tid in (0, caller):
+            continue
+        try:
+            os.sched_setaffinity(tid, previous.get(tid, default))
+        except ProcessLookupError:
+            continue
+
+
+@contextmanager
+def thread_budget(num_threads: Optional[int] = None, cpus: Optional[Iterable[int]] = None):
+    """
+    Run a block with a given intra-op thread count and CPU affinity.
+
+    Both settings are process-wide: torch has a single intra-op pool, and
+    the affinity is applied to every thread of the process, including
+    torch's existing workers but also the asyncio and download executor
+    threads (and any FFmpeg processes they start during the stage). They
+    act as per-stage budgets only because the pipeline never runs
+    transcription and summarization at the same time. Previous settings are restored on exit. Affinity pinning is
+    skipped on platforms without os.sched_setaffinity.
+
+    Args:
+        num_threads: Intra-op thread count, or None to keep the current one
+        cpus: CPU ids to pin the process to, or None
+
+    Raises:
+        ValueError: If a requested CPU is not available to this process
+    """
+    import torch
+
+    previous_threads = None
+    previous_cpus = None
+
+    if num_threads:
+        previous_threads = torch.get_num_threads()
+        torch.set_num_threads(num_threads)
+
+    if cpus:
+        if hasattr(os, "sched_setaffinity"):
+            check_cpus_available(cpus)
+            previous_cpus = _set_process_affinity(set(cpus))
+        else:
+            logger.warning("CPU affinity is not supported on this platform")
+
+    try:
+        yield
+    finally:
+        if previous_threads is not None:
+            torch.set_num_threads(previous_threads)
+        if previous_cpus is not None:
+            _restore_process_affinity(previous_cpus)
+
+
+def available_cpu_count() -> int:
+    """Return the number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def default_thread_candidates() -> List[int]:
+    """Return thread counts to sweep: powers of two up to the CPU count."""
+    cpu_count = available_cpu_count()
+    candidates = []
+    n = 1
+    while n < cpu_count:
+        candidates.append(n)
+        n *= 2
+    candidates.append(cpu_count)
+    return candidates
+
+
+def _model_key(whisper_model: str, summarizer_model: str) -> str:
+    """Key under which a host's profile for a model pair is stored."""
+    return f"{whisper_model}|{summarizer_model}"
+
+
+def _read_profiles(profile_path: Path) -> Dict:
+    """Read all recorded profiles, or an empty dict if the file is unreadable."""
+    if not profile_path.exists():
+        return {}
+
+    try:
+        return json.loads(profile_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to read tuning profile {profile_path}: {str(e)}")
+        return {}
+
+
+def load_profile(
+    whisper_model: str, summarizer_model: str, path: Optional[str] = None
+) -> Optional[Dict]:
+    """
+    Load the tuning profile recorded for this machine and model pair.
+
+    Thread counts tuned for one model size rarely suit another, so a
+    profile is only used for the models it was recorded with.
+
+    Args:
+        whisper_model: Whisper model size in use
+        summarizer_model: Summarization model in use
+        path: Profile file path (default: ~/.cache/youtube-summarizer/tuning.json)
+
+    Returns:
+        Profile dictionary, or None if none was recorded for this host and models
+    """
+    profile_path = Path(path) if path else DEFAULT_PROFILE_PATH
+    host_profiles = _read_profiles(profile_path).get(socket.gethostname(), {})
+    return host_profiles.get(_model_key(whisper_model, summarizer_model))
+
+
+def save_profile(profile: Dict, path: Optional[str] = None) -> Path:
+    """
+    Record a tuning profile for this machine and the profile's model pair,
+    keeping all other entries.
+
+    Args:
+        profile: Profile dictionary with 'whisper_model' and 'summarizer_model'
+        path: Profile file path (default: ~/.cache/youtube-summarizer/tuning.json)
+
+    Returns:
+        Path the profile was written to
+    """
+    profile_path = Path(path) if path else DEFAULT_PROFILE_PATH
+    profile_path.parent.mkdir(parents=True, exist_ok=True)
+
+    profiles = _read_profiles(profile_path)
+    host_profiles = profiles.setdefault(socket.gethostname(), {})
+    host_profiles[_model_key(profile["whisper_model"], profile["summarizer_model"])] = profile
+    profile_path.write_text(json.dumps(profiles, indent=2), encoding="utf-8")
+    return profile_path
+
+
+def _time_call(repeats: int, fn, *args, **kwargs) -> float:
+    """Return the median wall-clock seconds of fn(*args, **kwargs) over several runs."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def autotune(
+    sample_audio: str,
+    whisper_model: str = "base",
+    summarizer_model: str = "facebook/bart-large-cnn",
+    candidates: Optional[List[int]] = None,
+    cpus: Optional[List[int]] = None,
+    profile_path: Optional[str] = None,
+    repeats: int = 3,
+) -> Dict:
+    """
+    Sweep thread counts for each stage on a sample and record the fastest.
+
+    Args:
+        sample_audio: Path to a local audio file to benchmark with
+        whisper_model: Whisper model size for transcription
+        summarizer_model: Hugging Face model for summarization
+        candidates: Thread counts to try (default: powers of two up to CPU count)
+        cpus: Optional CPU ids to pin both stages to while tuning
+        profile_path: Where to record the result
+        repeats: Runs per candidate; the median time is used
+
+    Returns:
+        The recorded profile
+    """
+    from transcriber import Transcriber
+    from summarizer import Summarizer
+
+    candidates = candidates or default_thread_candidates()
+    logger.info(f"Auto-tuning thread counts over {candidates}")
+
+    transcriber = Transcriber(model_size=whisper_model, cpu_affinity=cpus)
+    summarizer = Summarizer(model_name=summarizer_model, cpu_affinity=cpus)
+    transcriber.load_model()
+    summarizer.load_model()
+
+    # Warm-up run so one-off allocation costs don't skew the first candidate
+    transcript = transcriber.transcribe(sample_audio)
+    if not transcript:
+        raise ValueError(f"Sample produced an empty transcript: {sample_audio}")
+
+    transcribe_timings = {}
+    for n in candidates:
+        transcriber.num_threads = n
+        transcribe_timings[n] = _time_call(repeats, transcriber.transcribe, sample_audio)
+        logger.info(f"transcribe threads={n}: {transcribe_timings[n]:.2f}s")
+
+    summarize_timings = {}
+    summarizer.summarize(transcript)
+    for n in candidates:
+        summarizer.num_threads = n
+        summarize_timings[n] = _time_call(repeats, summarizer.summarize, transcript)
+        logger.info(f"summarize threads={n}: {summarize_timings[n]:.2f}s")
+
+    profile = {
+        "transcribe_threads": min(transcribe_timings, key=transcribe_timings.get),
+        "summarize_threads": min(summarize_timings, key=summarize_timings.get),
+        "cpu_count": available_cpu_count(),
+        "repeats": repeats,
+        "whisper_model": whisper_model,
+        "summarizer_model": summarizer_model,
+        "timings": {
+            "transcribe": {str(n): t for n, t in transcribe_timings.items()},
+            "summarize": {str(n): t for n, t in summarize_timings.items()},
+        },
+    }
+    saved_path = save_profile(profile, profile_path)
+    logger.info(
+        f"Best: transcribe_threads={profile['transcribe_threads']} "
+        f"summarize_threads={profile['summarize_threads']} (saved to {saved_path})"
+    )
+    return profile
+
+
+# In[ ]: